@@ -0,0 +1,66 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+from guessapp.cache import index_cache
+from guessapp.index import WordIndex
+from guessapp.middleware import QueryCounter, request_queries
+
+
+class Coalescer:
+    def __init__(self) -> None:
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    def submit(self, key, executor: ThreadPoolExecutor, fn, *args) -> Future:
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                future = executor.submit(fn, *args)
+                self._futures[key] = future
+                future.add_done_callback(lambda _: self.__discard(key, future))
+            return future
+
+    async def run(self, key, executor: ThreadPoolExecutor, fn, *args):
+        return await asyncio.shield(asyncio.wrap_future(self.submit(key, executor, fn, *args)))
+
+    def __discard(self, key, future: Future):
+        with self._lock:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+
+
+db_executor = ThreadPoolExecutor(max_workers=settings.GUESSAPP_DB_THREADS, thread_name_prefix="guessapp-db")
+
+index_loads = Coalescer()
+
+
+async def get_index(wordlist_name: str, word_length: int) -> WordIndex:
+    index = index_cache.peek(wordlist_name, word_length)
+    if index is not None:
+        return index
+    key = (wordlist_name, word_length)
+    return await index_loads.run(key, db_executor, _load_index, wordlist_name, word_length, request_queries.get())
+
+
+async def run_blocking(fn, *args):
+    return await asyncio.wrap_future(db_executor.submit(_run_blocking, request_queries.get(), fn, *args))
+
+
+def _load_index(wordlist_name: str, word_length: int, queries: QueryCounter = None) -> WordIndex:
+    return _run_blocking(queries, index_cache.get, wordlist_name, word_length)
+
+
+def _run_blocking(queries: QueryCounter, fn, *args):
+    close_old_connections()
+    try:
+        with connection.execute_wrapper(queries or QueryCounter()):
+            return fn(*args)
+    finally:
+        close_old_connections()
@@ -0,0 +1,98 @@
+import unicodedata
+
+import numpy as np
+
+
+NORMALIZATION_FORMS = ("NFC", "NFD", "NFKC", "NFKD")
+
+LATIN = "abcdefghijklmnopqrstuvwxyz"
+
+UMLAUTS = ["ä", "ö", "ü", "ß"]
+
+
+class Alphabet:
+    def __init__(
+        self, name: str, letters: str, foldings: dict = {}, form: str = "NFC", strip_marks: bool = False
+    ) -> None:
+        if form not in NORMALIZATION_FORMS:
+            raise ValueError(f'Unknown normalization form "{form}"')
+        if len(set(letters)) != len(letters):
+            raise ValueError(f'Alphabet "{name}" contains duplicate letters')
+
+        self.name = name
+        self.letters = letters
+        self.form = form
+        self.strip_marks = strip_marks
+        self._foldings = str.maketrans(foldings)
+        self._codes = {letter: code for code, letter in enumerate(letters)}
+        self._lookup = np.full(max(map(ord, letters), default=0) + 2, -1, dtype=np.int32)
+        self._lookup[[ord(letter) for letter in letters]] = np.arange(len(letters))
+
+    @classmethod
+    def from_text(cls, text: str) -> "Alphabet":
+        return cls("", "".join(sorted(set(text))))
+
+    @property
+    def dtype(self) -> np.dtype:
+        return code_dtype(len(self))
+
+    def __len__(self) -> int:
+        return len(self.letters)
+
+    def __contains__(self, letter: str) -> bool:
+        return letter in self._codes
+
+    def normalize(self, word: str) -> str:
+        word = unicodedata.normalize("NFC", word.lower()).translate(self._foldings)
+        word = unicodedata.normalize(self.form, word)
+        if self.strip_marks:
+            word = "".join(char for char in word if not unicodedata.combining(char))
+        return word
+
+    def is_valid(self, word: str) -> bool:
+        return all(char in self._codes for char in word)
+
+    def code(self, letter: str) -> int:
+        try:
+            return self._codes[letter]
+        except KeyError:
+            raise ValueError(f'Letter "{letter}" is not part of alphabet "{self.name}"') from None
+
+    def encode(self, word: str) -> list:
+        return [self.code(letter) for letter in word]
+
+    def decode(self, codes) -> str:
+        return "".join(self.letters[code] for code in codes)
+
+    def encode_text(self, text: str, word_length: int) -> np.ndarray:
+        codepoints = np.frombuffer(text.encode("utf-32-le"), dtype="<u4")
+        codes = self._lookup[np.minimum(codepoints, len(self._lookup) - 1)]
+        if (codes < 0).any():
+            raise ValueError(f'Text contains letters which are not part of alphabet "{self.name}"')
+        return codes.astype(self.dtype).reshape(-1, word_length)
+
+
+ALPHABETS = {}
+
+
+def register_alphabet(alphabet: Alphabet) -> Alphabet:
+    ALPHABETS[alphabet.name] = alphabet
+    return alphabet
+
+
+def get_alphabet(name: str) -> Alphabet:
+    try:
+        return ALPHABETS[name]
+    except KeyError:
+        raise ValueError(f'Unknown alphabet "{name}"') from None
+
+
+def code_dtype(alphabet_size: int) -> np.dtype:
+    return np.dtype(np.uint8 if alphabet_size <= 256 else "<u2")
+
+
+ENGLISH = register_alphabet(Alphabet("en", LATIN, form="NFD", strip_marks=True))
+
+GERMAN = register_alphabet(Alphabet("de", LATIN + "".join(UMLAUTS)))
+
+GERMAN_FOLDED = register_alphabet(Alphabet("de-folded", LATIN, foldings=dict(zip(UMLAUTS, ["ae", "oe", "ue", "ss"]))))
@@ -1,6 +1,31 @@
+import gc
+import warnings
+
 from django.apps import AppConfig
+from django.conf import settings
+from django.db import DatabaseError, connections
 
 
 class GuessappConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "guessapp"
+
+    def ready(self):
+        if settings.GUESSAPP_PRELOAD_INDEXES:
+            preload_indexes()
+
+
+def preload_indexes() -> list:
+    from guessapp.cache import index_cache
+
+    try:
+        keys = index_cache.warm()
+    except DatabaseError as error:
+        warnings.warn(f"Could not preload word indexes: {error}")
+        return []
+    finally:
+        connections.close_all()
+
+    gc.collect()
+    gc.freeze()
+    return keys
@@ -0,0 +1,116 @@
+import platform
+import random
+import time
+
+from django.db import connection, transaction
+
+from guessapp.guesser import Guesser
+from guessapp.importer import WordlistImporter
+from guessapp.index import WordIndex
+from guessapp.memo import guess_memo
+from guessapp.models import Word
+
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+LETTERS = "enisratdhulcgmobwfkzpvüäöj"
+
+LETTER_WEIGHTS = [17, 10, 8, 7, 7, 6, 6, 5, 5, 4, 3, 3, 3, 3, 3, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1]
+
+
+def synthetic_words(count: int, seed: int = 0, min_length: int = 3, max_length: int = 9) -> list:
+    rng = random.Random(seed)
+    return ["".join(rng.choices(LETTERS, LETTER_WEIGHTS, k=rng.randint(min_length, max_length))) for _ in range(count)]
+
+
+def measure(fn, repeat: int) -> float:
+    elapsed_times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        fn()
+        elapsed_times.append(time.perf_counter() - start_time)
+    return min(elapsed_times)
+
+
+def benchmark_size(size: int, repeat: int = 3, database: bool = True) -> dict:
+    lines = synthetic_words(size, seed=size)
+    importer = WordlistImporter(lines)
+    raters = importer._wordlist_raters.values()
+    word_count = sum(len(rater.words) for rater in raters)
+    index = WordIndex(sorted(importer._wordlist_raters[5].words), 5)
+    constraints = {
+        "excluded_characters": ["x", "q"],
+        "safe_characters": {"e": 1},
+        "characters_anywhere": {"n": 1},
+        "characters_excluded_at": {"n": [0]},
+    }
+
+    def guess():
+        guess_memo.clear()
+        Guesser(index, 5, **constraints).guess()
+
+    results = {
+        "readlines": (measure(lambda: WordlistImporter(lines), repeat), size),
+        "rate": (measure(lambda: [rater.rate(word) for rater in raters for word in rater.words], repeat), word_count),
+        "validate": (measure(lambda: Guesser(index, 5, **constraints).validate(), repeat), 1),
+        "guess": (measure(guess, repeat), 1),
+    }
+
+    if database:
+        results.update(benchmark_database(importer, word_count, repeat))
+
+    return {
+        f"{name}[{size}]": {
+            "seconds": seconds,
+            "items": items,
+            "items_per_second": items / seconds if seconds else None,
+        }
+        for name, (seconds, items) in results.items()
+    }
+
+
+def benchmark_database(importer: WordlistImporter, word_count: int, repeat: int) -> dict:
+    with transaction.atomic():
+        start_time = time.perf_counter()
+        wordlist_name = f"benchmark-{time.time_ns()}"
+        importer.persist(wordlist_name)
+        persist_time = time.perf_counter() - start_time
+
+        queryset = Word.objects.filter(wordlist__name=wordlist_name, length=5).order_by("-rating")
+        query_time = measure(lambda: list(queryset.values_list("word", "rating")), repeat)
+        query_count = queryset.count()
+        transaction.set_rollback(True)
+
+    return {"persist": (persist_time, word_count), "query": (query_time, query_count)}
+
+
+def run_benchmarks(sizes: list = DEFAULT_SIZES, repeat: int = 3, database: bool = True) -> dict:
+    results = {}
+    for size in sizes:
+        results.update(benchmark_size(size, repeat, database))
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": connection.vendor if database else None,
+            "sizes": sizes,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare_benchmarks(baseline: dict, current: dict, threshold: float = 0.1) -> list:
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if not previous or not previous["seconds"]:
+            continue
+
+        change = result["seconds"] / previous["seconds"] - 1
+        if change > threshold:
+            regressions.append(
+                {"name": name, "baseline": previous["seconds"], "current": result["seconds"], "change": change}
+            )
+    return regressions
@@ -0,0 +1,126 @@
+from collections import OrderedDict
+import threading
+import time
+
+from django.conf import settings
+
+from guessapp.alphabet import get_alphabet
+from guessapp.index import WordIndex
+from guessapp.metrics import metrics
+from guessapp.models import Word, Wordlist
+from guessapp.wordfile import WordlistFile, wordlist_path
+
+
+class WordIndexCache:
+    def __init__(self, max_bytes: int = None) -> None:
+        self._max_bytes = max_bytes
+        self._indexes = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return settings.GUESSAPP_INDEX_CACHE_BYTES
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._indexes
+
+    def peek(self, wordlist_name: str, word_length: int) -> WordIndex:
+        key = (wordlist_name, word_length)
+        with self._lock:
+            entry = self._indexes.get(key)
+            if entry is None or time.monotonic() - entry[2] > settings.GUESSAPP_INDEX_CHECK_SECONDS:
+                return None
+            self._indexes.move_to_end(key)
+            metrics.increment("index_cache_hits")
+            return entry[0]
+
+    def get(self, wordlist_name: str, word_length: int) -> WordIndex:
+        index = self.peek(wordlist_name, word_length)
+        if index is not None:
+            return index
+
+        key = (wordlist_name, word_length)
+        revision = self.revision(wordlist_name)
+        with self._lock:
+            entry = self._indexes.get(key)
+            if entry is not None and entry[1] == revision:
+                self._indexes[key] = (entry[0], revision, time.monotonic())
+                self._indexes.move_to_end(key)
+                metrics.increment("index_cache_hits")
+                return entry[0]
+
+        metrics.increment("index_cache_misses")
+        index = self.load(wordlist_name, word_length, revision)
+
+        with self._lock:
+            entry = self._indexes.get(key)
+            if entry is None or entry[1] != revision:
+                if entry is not None:
+                    self._size_bytes -= entry[0].nbytes
+                self._indexes[key] = (index, revision, time.monotonic())
+                self._size_bytes += index.nbytes
+                self.__evict()
+            return self._indexes.get(key, (index,))[0]
+
+    def revision(self, wordlist_name: str) -> tuple:
+        revision = Wordlist.objects.filter(name=wordlist_name).values_list("pk", "version").first()
+        if revision is None:
+            raise Wordlist.DoesNotExist(f'Wordlist "{wordlist_name}" does not exist')
+        return revision
+
+    def load(self, wordlist_name: str, word_length: int, revision: tuple) -> WordIndex:
+        try:
+            wordlist_file = WordlistFile.load(wordlist_path(wordlist_name, word_length))
+            if wordlist_file.revision == revision:
+                return wordlist_file.index()
+        except (FileNotFoundError, ValueError):
+            pass
+        return self.load_database(wordlist_name, word_length)
+
+    def load_database(self, wordlist_name: str, word_length: int) -> WordIndex:
+        alphabet_name = Wordlist.objects.filter(name=wordlist_name).values_list("alphabet", flat=True).first()
+        if alphabet_name is None:
+            raise Wordlist.DoesNotExist(f'Wordlist "{wordlist_name}" does not exist')
+
+        rows = (
+            Word.objects.filter(wordlist__name=wordlist_name, length=word_length)
+            .order_by("-rating", "id")
+            .values_list("word", "rating")
+        )
+        words = []
+        ratings = []
+        for word, rating in rows.iterator(chunk_size=10000):
+            words.append(word)
+            ratings.append(rating)
+        return WordIndex(words, word_length, ratings, get_alphabet(alphabet_name) if alphabet_name else None)
+
+    def warm(self, wordlist_names: list = None) -> list:
+        rows = Word.objects.order_by("wordlist__name", "length").values_list("wordlist__name", "length").distinct()
+        if wordlist_names is not None:
+            rows = rows.filter(wordlist__name__in=wordlist_names)
+
+        keys = list(rows)
+        for wordlist_name, word_length in keys:
+            self.get(wordlist_name, word_length)
+        return keys
+
+    def invalidate(self, wordlist_name: str = None):
+        with self._lock:
+            for key in list(self._indexes):
+                if wordlist_name is None or key[0] == wordlist_name:
+                    self._size_bytes -= self._indexes.pop(key)[0].nbytes
+
+    def __evict(self):
+        while self._size_bytes > self.max_bytes and len(self._indexes) > 1:
+            _, entry = self._indexes.popitem(last=False)
+            self._size_bytes -= entry[0].nbytes
+
+
+index_cache = WordIndexCache()
@@ -0,0 +1,100 @@
+import numpy as np
+
+
+GREY = 0
+YELLOW = 1
+GREEN = 2
+
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def feedback_pattern(guess: str, answer: str) -> int:
+    marks = [GREY] * len(guess)
+    remaining = {}
+
+    for idx, (guess_char, answer_char) in enumerate(zip(guess, answer)):
+        if guess_char == answer_char:
+            marks[idx] = GREEN
+        else:
+            remaining[answer_char] = remaining.get(answer_char, 0) + 1
+
+    for idx, guess_char in enumerate(guess):
+        if marks[idx] != GREEN and remaining.get(guess_char, 0) > 0:
+            marks[idx] = YELLOW
+            remaining[guess_char] -= 1
+
+    return encode_pattern(marks)
+
+
+def encode_pattern(marks: list) -> int:
+    return sum(mark * 3**idx for idx, mark in enumerate(marks))
+
+
+def decode_pattern(pattern: int, word_length: int) -> list:
+    marks = []
+    for _ in range(word_length):
+        pattern, mark = divmod(pattern, 3)
+        marks.append(mark)
+    return marks
+
+
+def pattern_dtype(word_length: int) -> np.dtype:
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if 3**word_length - 1 <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise ValueError(f"Feedback patterns of words with length {word_length} do not fit into 64 bits")
+
+
+def encode_words(text: str, word_length: int) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).reshape(-1, word_length)
+
+
+def feedback_matrix(
+    guesses: np.ndarray, answers: np.ndarray, chunk_bytes: int = DEFAULT_CHUNK_BYTES, alphabet_size: int = None
+) -> np.ndarray:
+    word_length = guesses.shape[1]
+    matrix = np.empty((len(guesses), len(answers)), dtype=pattern_dtype(word_length))
+    for start, end in chunks(len(guesses), len(answers) * word_length, chunk_bytes):
+        matrix[start:end] = _feedback_block(guesses[start:end], answers, alphabet_size)
+    return matrix
+
+
+def chunks(rows: int, row_bytes: int, chunk_bytes: int = DEFAULT_CHUNK_BYTES):
+    chunk_rows = max(1, chunk_bytes // max(1, row_bytes))
+    for start in range(0, rows, chunk_rows):
+        yield start, min(start + chunk_rows, rows)
+
+
+def _feedback_block(guesses: np.ndarray, answers: np.ndarray, alphabet_size: int = None) -> np.ndarray:
+    word_length = guesses.shape[1]
+    dtype = pattern_dtype(word_length)
+    if alphabet_size is None:
+        letters, codes = np.unique(np.concatenate([guesses, answers]), return_inverse=True)
+        codes = codes.reshape(-1, word_length)
+        guesses, answers = np.split(codes, [len(guesses)])
+        alphabet_size = len(letters)
+
+    letter_counts = np.zeros((alphabet_size, len(answers)), dtype=np.int8)
+    for idx in range(word_length):
+        np.add.at(letter_counts, (answers[:, idx], np.arange(len(answers))), 1)
+
+    green = [guesses[:, idx, None] == answers[None, :, idx] for idx in range(word_length)]
+    patterns = np.zeros((len(guesses), len(answers)), dtype=dtype)
+
+    for idx in range(word_length):
+        available = letter_counts[guesses[:, idx]]
+        available -= green[idx]
+        rank = np.zeros_like(available)
+        for other in range(word_length):
+            rows = np.flatnonzero(guesses[:, other] == guesses[:, idx])
+            if other == idx or not rows.size:
+                continue
+            available[rows] -= green[other][rows]
+            if other < idx:
+                rank[rows] += ~green[other][rows]
+
+        yellow = ~green[idx] & (rank < available)
+        marks = yellow.view(np.uint8) + green[idx].view(np.uint8) * np.uint8(GREEN)
+        patterns += marks.astype(dtype) * dtype.type(3**idx)
+
+    return patterns
@@ -1,4 +1,19 @@
-from collections import defaultdict
+from itertools import islice
+
+from guessapp.index import WordIndex
+from guessapp.memo import guess_memo
+from guessapp.metrics import metrics
+from guessapp.openings import opening_books
+from guessapp.patterns import pattern_matrices
+from guessapp.query import (
+    GuessQuery,
+    validate_characters_anywhere,
+    validate_characters_excluded_at,
+    validate_excluded_characters,
+    validate_safe_characters,
+)
+from guessapp.recommender import Recommender
+from guessapp.search import PatternQuery
 
 
 class Guesser:
@@ -6,7 +21,7 @@ class Guesser:
         self,
         wordlist: list,
         word_length: int,
-        excluded_characters: list = ["ä", "ö", "ü", "ß"],
+        excluded_characters: list = [],
         safe_characters: dict = {},
         characters_anywhere: dict = {},
         characters_excluded_at: dict = {},
@@ -17,6 +32,13 @@ class Guesser:
         self.__safe_characters = safe_characters
         self.__characters_anywhere = characters_anywhere
         self.__characters_excluded_at = characters_excluded_at
+        self.__query = None
+
+    @classmethod
+    def from_query(cls, wordlist: list, query: GuessQuery) -> "Guesser":
+        guesser = cls(wordlist, query.word_length)
+        guesser.__query = query
+        return guesser
 
     def validate(
         self,
@@ -26,6 +48,25 @@ class Guesser:
         validate_safe_characters: bool = True,
         validate_characters_anywhere: bool = True,
         validate_characters_excluded_at: bool = True,
+    ):
+        with metrics.timer("guess_seconds", "validate"):
+            self.__validate(
+                validate_wordlist_not_empty,
+                validate_word_length,
+                validate_excluded_characters,
+                validate_safe_characters,
+                validate_characters_anywhere,
+                validate_characters_excluded_at,
+            )
+
+    def __validate(
+        self,
+        validate_wordlist_not_empty: bool,
+        validate_word_length: bool,
+        validate_excluded_characters: bool,
+        validate_safe_characters: bool,
+        validate_characters_anywhere: bool,
+        validate_characters_excluded_at: bool,
     ):
         if validate_wordlist_not_empty:
             self.__validate_wordlist_not_empty()
@@ -50,93 +91,73 @@ class Guesser:
             raise ValueError("Empty wordlist")
 
     def __validate_word_length(self):
+        if isinstance(self.__wordlist, WordIndex) and self.__wordlist.word_length == self.__word_length:
+            return
+
         for word in self.__wordlist:
             if len(word) != self.__word_length:
                 raise ValueError(f'Unexpected length of word in wordlist: "{word}" with length of: {len(word)}')
 
     def __validate_excluded_characters(self):
-        for char in self.__excluded_characters:
-            if not char:
-                raise ValueError("Missing character in exluded_chars list")
-
-            if len(char) != 1:
-                raise ValueError("Only one character per exclusion allowed in exluded_chars list")
+        validate_excluded_characters(self.__excluded_characters)
 
     def __validate_safe_characters(self):
-        safe_chars = defaultdict(int)
-        for char, idx in self.__safe_characters.items():
-            if not char:
-                raise ValueError("Missing character in safe_characters dict")
-
-            if len(char) != 1:
-                raise ValueError("Only one character per safe character allowed in safe_characters dict")
-
-            if idx is None:
-                raise ValueError(f'Missing index in safe_characters for character "{char}"')
-
-            if not isinstance(idx, int):
-                raise TypeError(f'Type of index is not integer of safe_characters character "{char}"')
-
-            if idx < 0 or idx > self.__word_length - 1:
-                raise IndexError(f'Index of safe character "{char}" out of bounds')
-
-            for c, i in safe_chars.items():
-                if not c == char and i == idx:
-                    raise ValueError(f'Safe character "{char}" index is already reserved by "{c}"')
-
-            safe_chars[char] = idx
+        validate_safe_characters(self.__safe_characters, self.__word_length)
 
     def __validate_characters_anywhere(self):
-        for char, occurences in self.__characters_anywhere.items():
-            if not char:
-                raise ValueError("Missing character in characters_anywhere dict")
-
-            if len(char) != 1:
-                raise ValueError("Only one character per anywhere character allowed in characters_anywhere dict")
-
-            if occurences is None:
-                raise ValueError(f'No occurences defined in safe_characters for character "{char}"')
-
-            if not isinstance(occurences, int):
-                raise TypeError(f'Type of amount of occurences is not integer of safe_characters character "{char}"')
-
-            if occurences < 1:
-                raise ValueError(
-                    f'Occurences of anywhere character "{char}" have to be at least 1'
-                )
-
-            if occurences > self.__word_length:
-                raise ValueError(
-                    f'Occurences of anywhere character "{char}" cannot exceed the amount of word character count '
-                    f'{self.__word_length}'
-                )
+        validate_characters_anywhere(self.__characters_anywhere, self.__word_length)
 
     def __validate_characters_excluded_at(self):
-        for char, idx_list in self.__characters_excluded_at.items():
-            if not char:
-                raise ValueError("Missing character in characters_excluded_at dict")
-
-            if len(char) != 1:
-                raise ValueError("Only one character per exclusion allowed in characters_excluded_at dict")
-
-            if not idx_list:
-                raise ValueError(f'Missing list of indices for characters_excluded_at character "{char}"')
-
-            if not isinstance(idx_list, list):
-                raise TypeError(
-                    f'Type of indices for characters_excluded_at is not list for character "{char}"'
-                )
-
-            for idx in idx_list:
-                if idx is None:
-                    raise ValueError(f'Missing index for characters_excluded_at character "{char}"')
-
-                if not isinstance(idx, int):
-                    raise TypeError(f'Type of index for characters_excluded_at is not integer for character "{char}"')
-
-                if idx < 0 or idx > self.__word_length - 1:
-                    raise IndexError(f'Index of characters_excluded_at character "{char}" out of bounds')
-
-    def guess(self) -> list:
-        wordlist = self.__wordlist
-        return wordlist
+        validate_characters_excluded_at(self.__characters_excluded_at, self.__word_length)
+
+    @property
+    def index(self) -> WordIndex:
+        if not isinstance(self.__wordlist, WordIndex):
+            self.__wordlist = WordIndex(self.__wordlist, self.__word_length)
+        return self.__wordlist
+
+    @property
+    def query(self) -> GuessQuery:
+        if self.__query is None:
+            self.__query = GuessQuery.compile(
+                self.__word_length,
+                self.__excluded_characters,
+                self.__safe_characters,
+                self.__characters_anywhere,
+                self.__characters_excluded_at,
+            )
+        return self.__query
+
+    def filter(self) -> int:
+        query = self.query
+        index = self.index
+        with metrics.timer("guess_seconds", "filter"):
+            return guess_memo.get_or_compute(f"{index.fingerprint.hex()}:{query.key}", lambda: query.filter(index))
+
+    def guess(self, limit: int = None, offset: int = 0) -> list:
+        with metrics.timer("guess_seconds", "rank"):
+            return [word for word, _ in self.ranked(limit, offset)]
+
+    def ranked(self, limit: int = None, offset: int = 0):
+        mask = self.filter()
+        index = self.index
+        indices = islice(index.indices(mask, offset), limit)
+        return ((index[idx], index.ratings[idx]) for idx in indices)
+
+    def search(self, pattern: str = "", contains: str = "", counts: dict = {}, regex: str = "") -> tuple:
+        pattern_query = PatternQuery.compile(pattern, contains, counts, regex)
+        mask = self.filter()
+        index = self.index
+        key = f"{index.fingerprint.hex()}:{self.query.key}:{pattern_query.key}"
+        with metrics.timer("guess_seconds", "search"):
+            return guess_memo.get_or_compute(key, lambda: pattern_query.filter(index, mask))
+
+    def recommend(self, limit: int = 10, hard_mode: bool = False) -> list:
+        mask = self.filter()
+        index = self.index
+        if limit == 1 and mask == index.all:
+            book = opening_books.get(index, hard_mode)
+            if book is not None:
+                return [book.lookup([])]
+        with metrics.timer("guess_seconds", "recommend"):
+            return Recommender(index, pattern_matrix=pattern_matrices.get(index)).recommend(mask, limit, hard_mode)
@@ -0,0 +1,77 @@
+from collections import Counter
+
+
+class Histogram:
+    def __init__(self, positions: list = None) -> None:
+        self.positions = positions if positions is not None else []
+
+    @classmethod
+    def from_words(cls, words) -> "Histogram":
+        histogram = cls()
+        histogram.update(words)
+        return histogram
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Histogram":
+        word_length = max((len(counts) for counts in data.values()), default=0)
+        positions = [Counter() for _ in range(word_length)]
+        for char, counts in data.items():
+            for idx, count in enumerate(counts):
+                if count:
+                    positions[idx][char] = count
+        return cls(positions)
+
+    @property
+    def word_length(self) -> int:
+        return len(self.positions)
+
+    @property
+    def character_counts(self) -> Counter:
+        counts = Counter()
+        for position in self.positions:
+            counts.update(position)
+        return counts
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Histogram) and self.to_json() == other.to_json()
+
+    def update(self, words):
+        self.__count(words, Counter.update)
+
+    def subtract(self, words):
+        self.__count(words, Counter.subtract)
+        for idx, position in enumerate(self.positions):
+            self.positions[idx] = +position
+
+    def merge(self, other: "Histogram"):
+        self.__extend(other.word_length)
+        for position, counts in zip(self.positions, other.positions):
+            position.update(counts)
+
+    def to_json(self) -> dict:
+        data = {}
+        for idx, position in enumerate(self.positions):
+            for char, count in position.items():
+                if count:
+                    data.setdefault(char, [0] * self.word_length)[idx] = count
+        return dict(sorted(data.items()))
+
+    def __count(self, words, count):
+        words = list(words)
+        if not words:
+            return
+
+        word_length = len(words[0])
+        if any(len(word) != word_length for word in words):
+            raise ValueError(f"All words in histogram have to be of length {word_length}")
+
+        self.__extend(word_length)
+        text = "".join(words)
+        for idx, position in enumerate(self.positions):
+            count(position, text[idx::word_length])
+
+    def __extend(self, word_length: int):
+        if self.positions and word_length and word_length != self.word_length:
+            raise ValueError(f"All words in histogram have to be of length {self.word_length}")
+        while len(self.positions) < word_length:
+            self.positions.append(Counter())
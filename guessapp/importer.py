@@ -1,57 +1,326 @@
-from collections import defaultdict
+import bz2
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import gzip
+from itertools import islice
+import lzma
 
-from django.db import transaction
-from guessapp.models import Wordlist
+from django.db import connection, transaction
+from django.db.models import F
+from guessapp.alphabet import Alphabet
+from guessapp.cache import index_cache
+from guessapp.histogram import Histogram
+from guessapp.metrics import metrics
+from guessapp.models import Word, Wordlist, WordlistHistogram
+from guessapp.scoring import rate_words as score_words
+from guessapp.wordfile import remove_wordlist_files
+from guessapp.words import count_characters, init_rating, rate_words, read_words
+
+
+DEFAULT_BATCH_SIZE = 5000
+
+DEFAULT_CHUNK_SIZE = 50000
+
+RATER_BUFFER_SIZE = 10000
+
+COMPRESSED_OPENERS = (
+    (b"\x1f\x8b", gzip.open),
+    (b"BZh", bz2.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+)
 
 
 class WordlistImporter:
-    def __init__(self, lines: set):
+    def __init__(self, lines: set, alphabet: Alphabet = None):
+        self._alphabet = alphabet
         self._wordlist_raters = defaultdict(WordlistRater)
         self.__readlines(lines)
 
     def __readlines(self, lines: set):
-        for line in lines:
-            word = line.strip()
-            word_len = len(word)
-            is_word = True
+        with metrics.timer("import_seconds", "read"):
+            for word in read_words(lines, self._alphabet):
+                self._wordlist_raters[len(word)].add(word)
 
-            for i in range(1, word_len):
-                if word[i].isupper():
-                    is_word = False
-                    break
+    @transaction.atomic
+    def persist(self, name: str, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        wordlist = Wordlist.objects.create(name=name, alphabet=self._alphabet.name if self._alphabet else "")
+        word_count = insert_words(wordlist, self.__rated_words(), batch_size)
+        histograms = {length: Histogram.from_words(rater.words) for length, rater in self._wordlist_raters.items()}
+        save_histograms(wordlist, histograms)
+        transaction.on_commit(lambda: invalidate_wordlist(name))
 
-            if is_word:
-                self._wordlist_raters[word_len].add(word.lower())
+        return word_count
 
     @transaction.atomic
-    def persist(self, name: str) -> int:
-        wordlist = Wordlist.objects.create(name=name)
-        word_count = 0
+    def update(self, name: str, batch_size: int = DEFAULT_BATCH_SIZE) -> tuple:
+        wordlist = Wordlist.objects.select_for_update().get(name=name)
+        stored_lengths = wordlist.words.order_by("length").values_list("length", flat=True).distinct()
+        histograms = {}
+        added_count = 0
+        removed_count = 0
 
+        for length in sorted(set(self._wordlist_raters) | set(stored_lengths)):
+            words = self._wordlist_raters[length].words
+            stored = dict(wordlist.words.filter(length=length).values_list("word", "id"))
+            additions = words - stored.keys()
+            removals = stored.keys() - words
+            if not additions and not removals:
+                continue
+
+            histogram = load_histogram(wordlist, length) or Histogram.from_words(stored)
+            stored_histogram = histogram.to_json()
+            histogram.update(additions)
+            histogram.subtract(removals)
+            rater = WordlistRater(histogram)
+
+            removal_ids = [stored[word] for word in removals]
+            with metrics.timer("import_seconds", "persist"):
+                for start in range(0, len(removal_ids), batch_size):
+                    end = start + batch_size
+                    Word.objects.filter(id__in=removal_ids[start:end]).delete()
+            insert_words(wordlist, ((word, rater.rate(word)) for word in additions), batch_size)
+
+            if wordlist.scoring != "frequency" or histogram.to_json() != stored_histogram:
+                _rerate_length(wordlist, length, wordlist.scoring, batch_size)
+            else:
+                histograms[length] = histogram
+            added_count += len(additions)
+            removed_count += len(removals)
+
+        save_histograms(wordlist, histograms)
+        if added_count or removed_count:
+            bump_version(wordlist)
+        transaction.on_commit(lambda: invalidate_wordlist(name))
+        return added_count, removed_count
+
+    def __rated_words(self):
         for rater in self._wordlist_raters.values():
             for word in rater.words:
-                wordlist.words.create(word=word, rating=rater.rate(word))
-                word_count += 1
-        wordlist.save()
+                yield word, rater.rate(word)
 
-        return word_count
+
+class StreamingWordlistImporter:
+    def __init__(self, open_lines, workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE, alphabet: Alphabet = None):
+        self._open_lines = open_lines
+        self._alphabet = alphabet
+        self._workers = workers
+        self._chunk_size = chunk_size
+        self._wordlist_raters = defaultdict(WordlistRater)
+        with metrics.timer("import_seconds", "read"):
+            self.__count()
+
+    def __count(self):
+        if self._workers > 1:
+            count = partial(count_characters, alphabet=self._alphabet)
+            with ProcessPoolExecutor(self._workers) as executor, self._open_lines() as lines:
+                for chunk_histograms in self.__map(executor, count, lines):
+                    for length, histogram in chunk_histograms.items():
+                        self._wordlist_raters[length].merge(histogram)
+            return
+
+        with self._open_lines() as lines:
+            for word in read_words(lines, self._alphabet):
+                self._wordlist_raters[len(word)].count(word)
+
+    @transaction.atomic
+    def persist(self, name: str, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        wordlist = Wordlist.objects.create(name=name, alphabet=self._alphabet.name if self._alphabet else "")
+        insert_words(wordlist, self.__rated_words(), batch_size, ignore_conflicts=True)
+        save_histograms(wordlist, stored_histograms(wordlist, batch_size))
+        transaction.on_commit(lambda: invalidate_wordlist(name))
+
+        return wordlist.words.count()
+
+    def __rated_words(self):
+        if self._workers > 1:
+            counts = {length: rater.character_counts for length, rater in self._wordlist_raters.items()}
+            initargs = (counts, self._alphabet)
+            with ProcessPoolExecutor(self._workers, initializer=init_rating, initargs=initargs) as executor:
+                with self._open_lines() as lines:
+                    for rated_words in self.__map(executor, rate_words, lines):
+                        yield from rated_words
+            return
+
+        with self._open_lines() as lines:
+            for word in read_words(lines, self._alphabet):
+                yield word, self._wordlist_raters[len(word)].rate(word)
+
+    def __map(self, executor: ProcessPoolExecutor, fn, lines):
+        pending = deque()
+        chunk = list(islice(lines, self._chunk_size))
+        while chunk:
+            pending.append(executor.submit(fn, chunk))
+            if len(pending) > self._workers:
+                yield pending.popleft().result()
+            chunk = list(islice(lines, self._chunk_size))
+
+        while pending:
+            yield pending.popleft().result()
 
 
 class WordlistRater:
-    def __init__(self):
+    def __init__(self, histogram: Histogram = None):
         self.words = set()
-        self._character_counts = defaultdict(int)
+        self._histogram = histogram if histogram is not None else Histogram()
+        self._pending = []
+        self._character_counts = None
+
+    @property
+    def histogram(self) -> Histogram:
+        if self._pending:
+            self._histogram.update(self._pending)
+            self._pending = []
+        return self._histogram
+
+    @property
+    def character_counts(self) -> Counter:
+        if self._character_counts is None:
+            self._character_counts = self.histogram.character_counts
+        return self._character_counts
 
     def add(self, word: str):
         self.words.add(word)
-        self.__add_to_char_count(word)
+        self.count(word)
+
+    def count(self, word: str):
+        self._pending.append(word)
+        self._character_counts = None
+        if len(self._pending) >= RATER_BUFFER_SIZE:
+            self._histogram.update(self._pending)
+            self._pending = []
 
-    def __add_to_char_count(self, word: str):
-        for char in word:
-            self._character_counts[char] += 1
+    def merge(self, histogram: Histogram):
+        self.histogram.merge(histogram)
+        self._character_counts = None
 
     def rate(self, word: str) -> int:
+        character_counts = self.character_counts
         rating = 0
         for char in set(word):
-            rating += self._character_counts[char]
+            rating += character_counts[char]
         return rating
+
+
+@transaction.atomic
+def rerate_wordlist(wordlist: Wordlist, model: str = "frequency", batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    word_count = 0
+    lengths = wordlist.words.order_by("length").values_list("length", flat=True).distinct()
+    for length in list(lengths):
+        word_count += _rerate_length(wordlist, length, model, batch_size)
+
+    wordlist.scoring = model
+    wordlist.save(update_fields=["scoring"])
+    bump_version(wordlist)
+    transaction.on_commit(lambda: invalidate_wordlist(wordlist.name))
+    return word_count
+
+
+def load_histogram(wordlist: Wordlist, length: int) -> Histogram:
+    positions = wordlist.histograms.filter(length=length).values_list("positions", flat=True).first()
+    return None if positions is None else Histogram.from_json(positions)
+
+
+def stored_histograms(wordlist: Wordlist, batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    histograms = {}
+    lengths = list(wordlist.words.order_by("length").values_list("length", flat=True).distinct())
+    for length in lengths:
+        histogram = Histogram()
+        words = wordlist.words.filter(length=length).values_list("word", flat=True).iterator(chunk_size=batch_size)
+        batch = list(islice(words, batch_size))
+        while batch:
+            histogram.update(batch)
+            batch = list(islice(words, batch_size))
+        histograms[length] = histogram
+    return histograms
+
+
+def save_histograms(wordlist: Wordlist, histograms: dict):
+    WordlistHistogram.objects.bulk_create(
+        [
+            WordlistHistogram(wordlist=wordlist, length=length, positions=histogram.to_json())
+            for length, histogram in histograms.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["wordlist", "length"],
+        update_fields=["positions"],
+    )
+
+
+def bump_version(wordlist: Wordlist):
+    Wordlist.objects.filter(pk=wordlist.pk).update(version=F("version") + 1)
+
+
+def invalidate_wordlist(name: str):
+    remove_wordlist_files(name)
+    index_cache.invalidate(name)
+
+
+def open_wordlist(filename: str):
+    with open(filename, "rb") as file:
+        magic = file.read(6)
+
+    for prefix, opener in COMPRESSED_OPENERS:
+        if magic.startswith(prefix):
+            return opener(filename, "rt", encoding="utf-8")
+    return open(filename, "r", encoding="utf-8")
+
+
+def insert_words(
+    wordlist: Wordlist, rated_words, batch_size: int = DEFAULT_BATCH_SIZE, ignore_conflicts: bool = False
+) -> int:
+    word_count = 0
+    rated_words = iter(rated_words)
+    with metrics.timer("import_seconds", "rate"):
+        batch = list(islice(rated_words, batch_size))
+
+    while batch:
+        with metrics.timer("import_seconds", "persist"):
+            if connection.vendor == "sqlite":
+                _execute_many(wordlist, batch, ignore_conflicts)
+            else:
+                Word.objects.bulk_create(
+                    [Word(wordlist=wordlist, word=word, rating=rating, length=len(word)) for word, rating in batch],
+                    batch_size=batch_size,
+                    ignore_conflicts=ignore_conflicts,
+                )
+        word_count += len(batch)
+        with metrics.timer("import_seconds", "rate"):
+            batch = list(islice(rated_words, batch_size))
+
+    return word_count
+
+
+def _execute_many(wordlist: Wordlist, batch: list, ignore_conflicts: bool):
+    quote_name = connection.ops.quote_name
+    columns = ", ".join(quote_name(column) for column in ("wordlist_id", "word", "rating", "length"))
+    insert = "INSERT OR IGNORE" if ignore_conflicts else "INSERT"
+    sql = f"{insert} INTO {quote_name(Word._meta.db_table)} ({columns}) VALUES (%s, %s, %s, %s)"
+
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [(wordlist.pk, word, rating, len(word)) for word, rating in batch])
+
+
+def _rerate_length(wordlist: Wordlist, length: int, model: str, batch_size: int) -> int:
+    rows = list(wordlist.words.filter(length=length).order_by("id").values_list("id", "word"))
+    if not rows:
+        save_histograms(wordlist, {length: Histogram()})
+        return 0
+
+    ids, words = zip(*rows)
+    with metrics.timer("import_seconds", "rate"):
+        ratings = score_words(words, length, model).tolist()
+    with metrics.timer("import_seconds", "persist"):
+        _update_ratings(list(zip(ratings, ids)), batch_size)
+        save_histograms(wordlist, {length: Histogram.from_words(words)})
+    return len(ids)
+
+
+def _update_ratings(rows: list, batch_size: int):
+    quote_name = connection.ops.quote_name
+    sql = f"UPDATE {quote_name(Word._meta.db_table)} SET {quote_name('rating')} = %s WHERE {quote_name('id')} = %s"
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            end = start + batch_size
+            cursor.executemany(sql, rows[start:end])
@@ -0,0 +1,198 @@
+from array import array
+import hashlib
+import sys
+
+import numpy as np
+
+from guessapp.alphabet import Alphabet
+
+
+FIRST_CHUNK_BYTES = 64
+
+MAX_CHUNK_BYTES = 8192
+
+
+class WordIndex:
+    def __init__(self, words: list, word_length: int, ratings: list = None, alphabet: Alphabet = None) -> None:
+        self.word_length = word_length
+        self._words = "".join(words)
+        self._size = len(words)
+        self.ratings = array("q", ratings if ratings is not None else [0] * self._size)
+        self._all = (1 << self._size) - 1
+        self._positions = []
+        self._counts = {}
+        self._fingerprint = None
+        self._alphabet = alphabet
+        self._codes = None
+
+        if any(len(word) != word_length for word in words):
+            raise ValueError(f"All words in index have to be of length {word_length}")
+
+        self.__build()
+
+    @classmethod
+    def from_masks(
+        cls,
+        text: str,
+        word_length: int,
+        ratings: array,
+        alphabet: Alphabet,
+        positions: list,
+        counts: dict,
+        codes: np.ndarray = None,
+    ) -> "WordIndex":
+        index = cls.__new__(cls)
+        index.word_length = word_length
+        index._words = text
+        index._size = len(text) // word_length
+        index.ratings = ratings
+        index._all = (1 << index._size) - 1
+        index._positions = positions
+        index._counts = {char: [index._all] + at_least for char, at_least in counts.items()}
+        index._fingerprint = None
+        index._alphabet = alphabet
+        index._codes = codes
+        return index
+
+    def __build(self):
+        step = self.word_length
+        for position in range(step):
+            column = self._words[position::step]
+            chars = set(column)
+            masks = {}
+            for char in chars:
+                masks[char] = _column_mask(column, chars, char)
+            self._positions.append(masks)
+
+        for char in set(self._words):
+            at_least = [self._all] + [0] * self.word_length
+            for masks in self._positions:
+                mask = masks.get(char, 0)
+                for count in range(self.word_length, 0, -1):
+                    at_least[count] |= at_least[count - 1] & mask
+            self._counts[char] = at_least
+
+    @property
+    def text(self) -> str:
+        return self._words
+
+    @property
+    def all(self) -> int:
+        return self._all
+
+    @property
+    def alphabet(self) -> Alphabet:
+        if self._alphabet is None:
+            self._alphabet = Alphabet.from_text(self._words)
+        return self._alphabet
+
+    @property
+    def codes(self):
+        if self._codes is None:
+            self._codes = self.alphabet.encode_text(self._words, self.word_length)
+        return self._codes
+
+    @property
+    def fingerprint(self) -> bytes:
+        if self._fingerprint is None:
+            self._fingerprint = hashlib.sha256(self._words.encode("utf-8")).digest()
+        return self._fingerprint
+
+    @property
+    def nbytes(self) -> int:
+        size = sys.getsizeof(self._words) + self.ratings.itemsize * len(self.ratings)
+        for masks in self._positions:
+            size += sum(sys.getsizeof(mask) for mask in masks.values())
+        for at_least in self._counts.values():
+            size += sum(sys.getsizeof(mask) for mask in at_least)
+        return size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, idx: int) -> str:
+        if idx < 0:
+            idx += self._size
+        if idx < 0 or idx >= self._size:
+            raise IndexError("Word index out of range")
+        start = idx * self.word_length
+        end = start + self.word_length
+        return self._words[start:end]
+
+    def __iter__(self):
+        for idx in range(self._size):
+            yield self[idx]
+
+    def find(self, word: str) -> int:
+        if len(word) != self.word_length:
+            return -1
+        mask = self._all
+        for idx, char in enumerate(word):
+            mask &= self.position_mask(idx, char)
+        return (mask & -mask).bit_length() - 1
+
+    def position_mask(self, idx: int, char: str) -> int:
+        return self._positions[idx].get(char, 0)
+
+    def count_mask(self, char: str, occurences: int) -> int:
+        if occurences <= 0:
+            return self._all
+        if occurences > self.word_length or char not in self._counts:
+            return 0
+        return self._counts[char][occurences]
+
+    def filter(
+        self,
+        excluded_characters: list = [],
+        safe_characters: dict = {},
+        characters_anywhere: dict = {},
+        characters_excluded_at: dict = {},
+    ) -> int:
+        result = self._all
+
+        for char, idx in safe_characters.items():
+            result &= self.position_mask(idx, char)
+
+        for char, occurences in characters_anywhere.items():
+            result &= self.count_mask(char, occurences)
+
+        for char, idx_list in characters_excluded_at.items():
+            for idx in idx_list:
+                result &= ~self.position_mask(idx, char)
+
+        for char in excluded_characters:
+            required = max(characters_anywhere.get(char, 0), 1 if char in safe_characters else 0)
+            result &= ~self.count_mask(char, required + 1)
+
+        return result
+
+    def indices(self, mask: int, offset: int = 0):
+        data = mask.to_bytes((self._size + 7) // 8, "little")
+        start = 0
+        chunk_size = FIRST_CHUNK_BYTES
+        while start < len(data):
+            end = min(start + chunk_size, len(data))
+            chunk = data[start:end]
+            count = int.from_bytes(chunk, "little").bit_count()
+            if count <= offset:
+                offset -= count
+            else:
+                positions = np.flatnonzero(np.unpackbits(np.frombuffer(chunk, dtype=np.uint8), bitorder="little"))
+                yield from (positions[offset:] + start * 8).tolist()
+                offset = 0
+            start = end
+            chunk_size = min(chunk_size * 2, MAX_CHUNK_BYTES)
+
+    def mask(self, indices) -> int:
+        bits = bytearray((self._size + 7) // 8)
+        for idx in indices:
+            bits[idx >> 3] |= 1 << (idx & 7)
+        return int.from_bytes(bits, "little")
+
+    def words(self, mask: int) -> list:
+        return [self[idx] for idx in self.indices(mask)]
+
+
+def _column_mask(column: str, chars: set, char: str) -> int:
+    table = str.maketrans({c: "1" if c == char else "0" for c in chars})
+    return int(column[::-1].translate(table), 2)
@@ -0,0 +1,40 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from guessapp.benchmarks import DEFAULT_SIZES, compare_benchmarks, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = "Runs the benchmark suite on synthetic word lists or compares two benchmark results"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--skip-db", action="store_true", help="Skip persist and query benchmarks")
+        parser.add_argument("--output", type=str, help="Write the JSON results to this file")
+        parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="Compare two result files")
+        parser.add_argument("--threshold", type=float, default=0.1, help="Allowed slowdown before flagging")
+
+    def handle(self, *args, **options):
+        if options["compare"]:
+            self.compare(*options["compare"], options["threshold"])
+            return
+
+        results = run_benchmarks(options["sizes"], options["repeat"], not options["skip_db"])
+        output = json.dumps(results, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(output)
+        self.stdout.write(output)
+
+    def compare(self, baseline_filename: str, current_filename: str, threshold: float):
+        with open(baseline_filename, encoding="utf-8") as file:
+            baseline = json.load(file)
+        with open(current_filename, encoding="utf-8") as file:
+            current = json.load(file)
+
+        regressions = compare_benchmarks(baseline, current, threshold)
+        self.stdout.write(json.dumps({"threshold": threshold, "regressions": regressions}, indent=2))
+        if regressions:
+            raise CommandError(f"{len(regressions)} benchmark(s) regressed by more than {threshold:.0%}")
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from guessapp.models import Wordlist
+
+
+class Command(BaseCommand):
+    help = "Compares query plans and timings of the length/rating lookup"
+
+    def add_arguments(self, parser):
+        parser.add_argument("wordlist", nargs=1, type=str)
+        parser.add_argument("length", nargs=1, type=int)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        wordlist_name = options["wordlist"][0]
+        word_length = options["length"][0]
+
+        wordlist = Wordlist.objects.filter(name=wordlist_name).first()
+        if not wordlist:
+            self.stdout.write(f'Wordlist "{wordlist_name}" does not exist')
+            return
+
+        querysets = {
+            "LENGTH() lookup": wordlist.words.filter(word__length=word_length).order_by("-rating"),
+            "length column": wordlist.words.filter(length=word_length).order_by("-rating"),
+        }
+
+        self.stdout.write(f"Database backend: {connection.vendor}")
+        for title, queryset in querysets.items():
+            elapsed_times = []
+            for _ in range(options["repeat"]):
+                start_time = time.time()
+                word_count = len(queryset.values_list("word", "rating"))
+                elapsed_times.append(time.time() - start_time)
+
+            self.stdout.write(f"\n{title}")
+            self.stdout.write(queryset.values_list("word", "rating").explain())
+            self.stdout.write(f"Read {word_count} words in {min(elapsed_times)} seconds (best of {options['repeat']})")
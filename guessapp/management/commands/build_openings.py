@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from guessapp.cache import index_cache
+from guessapp.feedback import DEFAULT_CHUNK_BYTES
+from guessapp.models import Wordlist
+from guessapp.openings import DEFAULT_RESPONSES, OpeningBook, write_opening_book
+from guessapp.patterns import pattern_matrices
+
+
+class Command(BaseCommand):
+    help = "Precomputes the best first guess and the best responses to its most frequent feedback patterns"
+
+    def add_arguments(self, parser):
+        parser.add_argument("wordlist", nargs=1, type=str)
+        parser.add_argument("length", nargs=1, type=int)
+        parser.add_argument("--responses", type=int, default=DEFAULT_RESPONSES)
+        parser.add_argument("--hard-mode", action="store_true", help="Only guess words which can still be the answer")
+        parser.add_argument("--chunk-bytes", type=int, default=DEFAULT_CHUNK_BYTES)
+
+    def handle(self, *args, **options):
+        wordlist_name = options["wordlist"][0]
+        word_length = options["length"][0]
+        start_time = time.time()
+
+        try:
+            index = index_cache.get(wordlist_name, word_length)
+        except Wordlist.DoesNotExist:
+            self.stdout.write(f'Wordlist "{wordlist_name}" does not exist')
+            return
+
+        book = OpeningBook.build(
+            index,
+            options["responses"],
+            options["hard_mode"],
+            pattern_matrices.get(index),
+            options["chunk_bytes"],
+        )
+        path = write_opening_book(book, index)
+        elapsed_time = time.time() - start_time
+
+        self.stdout.write(
+            f'Successfully wrote opening "{book.opening}" with {len(book.responses)} responses to {path} '
+            f"in {elapsed_time} seconds"
+        )
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from guessapp.cache import index_cache
+from guessapp.feedback import DEFAULT_CHUNK_BYTES
+from guessapp.models import Wordlist
+from guessapp.patterns import pattern_matrix_path, write_pattern_matrix
+
+
+class Command(BaseCommand):
+    help = "Precomputes the feedback pattern matrix of all words with the given length"
+
+    def add_arguments(self, parser):
+        parser.add_argument("wordlist", nargs=1, type=str)
+        parser.add_argument("length", nargs=1, type=int)
+        parser.add_argument("--chunk-bytes", type=int, default=DEFAULT_CHUNK_BYTES)
+
+    def handle(self, *args, **options):
+        wordlist_name = options["wordlist"][0]
+        word_length = options["length"][0]
+        start_time = time.time()
+
+        try:
+            index = index_cache.get(wordlist_name, word_length)
+        except Wordlist.DoesNotExist:
+            self.stdout.write(f'Wordlist "{wordlist_name}" does not exist')
+            return
+
+        path = pattern_matrix_path(index)
+        size = write_pattern_matrix(path, index, options["chunk_bytes"])
+        elapsed_time = time.time() - start_time
+
+        self.stdout.write(
+            f"Successfully wrote {len(index)}x{len(index)} patterns ({size} bytes) to {path} in {elapsed_time} seconds"
+        )
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from guessapp.cache import index_cache
+from guessapp.models import Wordlist
+from guessapp.wordfile import wordlist_path, write_wordlist_file
+
+
+class Command(BaseCommand):
+    help = "Exports all word lengths of a word list to memory mappable files in GUESSAPP_DATA_DIR"
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", nargs=1, type=str)
+
+    def handle(self, *args, **options):
+        name = options["name"][0]
+        start_time = time.time()
+
+        try:
+            wordlist = Wordlist.objects.get(name=name)
+        except Wordlist.DoesNotExist:
+            self.stdout.write(f'Wordlist "{name}" does not exist')
+            return
+
+        lengths = wordlist.words.order_by("length").values_list("length", flat=True).distinct()
+        for length in list(lengths):
+            revision = index_cache.revision(name)
+            index = index_cache.load_database(name, length)
+            path = wordlist_path(name, length)
+            size = write_wordlist_file(path, index, revision)
+            self.stdout.write(f"Wrote {len(index)} words ({size} bytes) to {path}")
+
+        elapsed_time = time.time() - start_time
+        self.stdout.write(f"Successfully exported {name} in {elapsed_time} Seconds")
@@ -1,27 +1,42 @@
-import argparse
+from functools import partial
 import time
 
 from django.core.management.base import BaseCommand
 from django.db import IntegrityError
 
-from guessapp.importer import WordlistImporter
+from guessapp.alphabet import ALPHABETS, get_alphabet
+from guessapp.importer import DEFAULT_BATCH_SIZE, StreamingWordlistImporter, WordlistImporter, open_wordlist
+from guessapp.metrics import metrics
+from guessapp.models import Wordlist
 
 
 class Command(BaseCommand):
-    help = "Import word list file"
+    help = "Import word list file, optionally compressed with gzip, bzip2 or xz"
 
     def add_arguments(self, parser):
         parser.add_argument("name", nargs=1, type=str)
-        parser.add_argument("filename", type=argparse.FileType("r", encoding="utf-8"))
+        parser.add_argument("filename", type=str)
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--workers", type=int, default=1, help="Number of processes rating the words")
+        parser.add_argument("--alphabet", choices=sorted(ALPHABETS), help="Normalize words and skip foreign letters")
+        parser.add_argument(
+            "--update", action="store_true", help="Replace the words of an existing wordlist with the file's words"
+        )
 
     def handle(self, *args, **options):
         name = options["name"][0]
-        content = options["filename"].read().splitlines()
 
         start_time = time.time()
-        importer = WordlistImporter(content)
+        if options["update"]:
+            self.update(name, options["filename"], options["alphabet"], options["batch_size"])
+            return
+
+        alphabet = get_alphabet(options["alphabet"]) if options["alphabet"] else None
+        importer = StreamingWordlistImporter(
+            partial(open_wordlist, options["filename"]), workers=options["workers"], alphabet=alphabet
+        )
         try:
-            persisted_count = importer.persist(name)
+            persisted_count = importer.persist(name, batch_size=options["batch_size"])
         except IntegrityError:
             self.stdout.write(f"A wordlist with the same name already exists: {name}")
             return
@@ -29,5 +44,28 @@ class Command(BaseCommand):
         elapsed_time = time.time() - start_time
 
         self.stdout.write(
-            f"Successfully persisted {persisted_count} words in {elapsed_time} Seconds"
+            f"Successfully persisted {persisted_count} words in {elapsed_time} Seconds "
+            f"({persisted_count / elapsed_time:.0f} words/s)"
+        )
+
+        if metrics.enabled:
+            for phase, summary in metrics.snapshot().get("import_seconds", {}).items():
+                self.stdout.write(f"{phase}: {summary['sum']} Seconds")
+
+    def update(self, name: str, filename: str, alphabet_name: str, batch_size: int):
+        start_time = time.time()
+        try:
+            wordlist = Wordlist.objects.get(name=name)
+        except Wordlist.DoesNotExist:
+            self.stdout.write(f'Wordlist "{name}" does not exist')
+            return
+
+        alphabet_name = alphabet_name or wordlist.alphabet
+        with open_wordlist(filename) as lines:
+            importer = WordlistImporter(lines, get_alphabet(alphabet_name) if alphabet_name else None)
+        added_count, removed_count = importer.update(name, batch_size=batch_size)
+        elapsed_time = time.time() - start_time
+
+        self.stdout.write(
+            f"Successfully added {added_count} and removed {removed_count} words in {elapsed_time} Seconds"
         )
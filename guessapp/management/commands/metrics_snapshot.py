@@ -0,0 +1,35 @@
+import json
+from urllib.request import urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Dumps a snapshot of the metrics exposed by a running server"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", type=str, default="http://localhost:8000/metrics")
+        parser.add_argument("--format", choices=["json", "text"], default="json")
+
+    def handle(self, *args, **options):
+        try:
+            with urlopen(options["url"]) as response:
+                text = response.read().decode("utf-8")
+        except OSError as e:
+            raise CommandError(f'Could not fetch metrics from {options["url"]}: {e}')
+
+        if options["format"] == "text":
+            self.stdout.write(text, ending="")
+            return
+
+        self.stdout.write(json.dumps(parse_prometheus(text), indent=2))
+
+
+def parse_prometheus(text: str) -> dict:
+    snapshot = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        name, value = line.rsplit(" ", 1)
+        snapshot[name] = float(value)
+    return snapshot
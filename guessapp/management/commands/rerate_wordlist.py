@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from guessapp.importer import DEFAULT_BATCH_SIZE, rerate_wordlist
+from guessapp.models import Wordlist
+from guessapp.scoring import SCORING_MODELS
+
+
+class Command(BaseCommand):
+    help = "Recomputes the ratings of an imported word list with the given scoring model"
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", nargs=1, type=str)
+        parser.add_argument("--model", choices=sorted(SCORING_MODELS), default="frequency")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        name = options["name"][0]
+        start_time = time.time()
+
+        try:
+            wordlist = Wordlist.objects.get(name=name)
+        except Wordlist.DoesNotExist:
+            self.stdout.write(f'Wordlist "{name}" does not exist')
+            return
+
+        word_count = rerate_wordlist(wordlist, options["model"], batch_size=options["batch_size"])
+        elapsed_time = time.time() - start_time
+
+        self.stdout.write(
+            f"Successfully rated {word_count} words with {options['model']} model in {elapsed_time} Seconds"
+        )
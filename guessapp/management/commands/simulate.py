@@ -0,0 +1,41 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from guessapp.cache import index_cache
+from guessapp.models import Wordlist
+from guessapp.simulation import DEFAULT_MAX_TURNS, STRATEGIES, GameSimulator, sample_answers
+
+
+class Command(BaseCommand):
+    help = "Plays a game for every answer of a word list length and reports guess counts, latencies and throughput"
+
+    def add_arguments(self, parser):
+        parser.add_argument("wordlist", nargs=1, type=str)
+        parser.add_argument("length", nargs=1, type=int)
+        parser.add_argument("--strategy", choices=STRATEGIES, default="entropy")
+        parser.add_argument("--hard-mode", action="store_true", help="Only guess words which can still be the answer")
+        parser.add_argument("--workers", type=int, default=1, help="Number of processes playing the games")
+        parser.add_argument("--sample", type=int, help="Play only this many evenly spaced answers")
+        parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+        parser.add_argument("--output", type=str, help="Write the JSON results to this file")
+
+    def handle(self, *args, **options):
+        wordlist_name = options["wordlist"][0]
+        word_length = options["length"][0]
+
+        try:
+            index = index_cache.get(wordlist_name, word_length)
+        except Wordlist.DoesNotExist:
+            self.stdout.write(f'Wordlist "{wordlist_name}" does not exist')
+            return
+
+        simulator = GameSimulator(
+            wordlist_name, index, options["strategy"], options["hard_mode"], max_turns=options["max_turns"]
+        )
+        results = simulator.simulate(sample_answers(len(index), options["sample"]), workers=options["workers"])
+        output = json.dumps(results, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(output)
+        self.stdout.write(output)
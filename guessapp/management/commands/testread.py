@@ -1,7 +1,9 @@
+from itertools import islice
 import time
 
 from django.core.management.base import BaseCommand
 
+from guessapp.cache import index_cache
 from guessapp.models import Wordlist
 
 
@@ -11,20 +13,32 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("wordlist", nargs=1, type=str)
         parser.add_argument("length", nargs=1, type=int)
+        parser.add_argument("--limit", type=int, default=20)
 
     def handle(self, *args, **options):
         wordlist_name = options["wordlist"][0]
         word_length = options["length"][0]
         start_time = time.time()
 
-        wordlist = Wordlist.objects.filter(name=wordlist_name).first()
-        if not wordlist:
+        try:
+            words = index_cache.get(wordlist_name, word_length)
+        except Wordlist.DoesNotExist:
             self.stdout.write(f'Wordlist "{wordlist_name}" does not exist')
             return
-
-        words = wordlist.words.filter(word__length=word_length).order_by("-rating")
         elapsed_time = time.time() - start_time
 
         self.stdout.write(
-            f'Successfully filtered {words.count()} words in wordlist "{wordlist_name}" in {elapsed_time} seconds'
+            f'Successfully filtered {len(words)} words in wordlist "{wordlist_name}" in {elapsed_time} seconds'
         )
+
+        start_time = time.time()
+        words = index_cache.get(wordlist_name, word_length)
+        elapsed_time = time.time() - start_time
+
+        self.stdout.write(f"Cached lookup of {len(words)} words took {elapsed_time} seconds")
+
+        start_time = time.time()
+        top = [words[idx] for idx in islice(words.indices(words.all), options["limit"])]
+        elapsed_time = time.time() - start_time
+
+        self.stdout.write(f"Top {len(top)} ranked words took {elapsed_time} seconds: {', '.join(top)}")
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from guessapp.cache import index_cache
+
+
+class Command(BaseCommand):
+    help = "Builds the word indexes of all word lengths up front"
+
+    def add_arguments(self, parser):
+        parser.add_argument("wordlists", nargs="*", type=str)
+
+    def handle(self, *args, **options):
+        start_time = time.time()
+        keys = index_cache.warm(options["wordlists"] or None)
+        elapsed_time = time.time() - start_time
+
+        for wordlist_name, word_length in keys:
+            if (wordlist_name, word_length) not in index_cache:
+                self.stdout.write(f'Index of wordlist "{wordlist_name}" with length {word_length} was evicted')
+
+        self.stdout.write(
+            f"Successfully built {len(keys)} indexes ({index_cache.size_bytes} bytes) in {elapsed_time} seconds"
+        )
@@ -0,0 +1,152 @@
+from collections import OrderedDict
+import hashlib
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from guessapp.metrics import metrics
+
+
+GENERATION_CHECK_SECONDS = 5
+
+
+class LocalMemoStore:
+    blocking = False
+
+    def __init__(self, max_size: int, ttl: float, max_bytes: int = None) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value, size = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._size_bytes -= size
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        size = value_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._size_bytes -= self._entries.pop(key)[2]
+            self._entries[key] = (expires_at, value, size)
+            self._size_bytes += size
+            while len(self._entries) > self.max_size or (
+                self.max_bytes is not None and self._size_bytes > self.max_bytes and len(self._entries) > 1
+            ):
+                self._size_bytes -= self._entries.popitem(last=False)[1][2]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+
+class DjangoCacheMemoStore:
+    blocking = True
+
+    def __init__(self, alias: str, ttl: float, prefix: str = "guessapp:memo:") -> None:
+        self.alias = alias
+        self.ttl = ttl
+        self.prefix = prefix
+        self._generation = None
+        self._generation_checked_at = 0.0
+
+    def get(self, key: str):
+        return caches[self.alias].get(self.__cache_key(key))
+
+    def set(self, key: str, value):
+        caches[self.alias].set(self.__cache_key(key), value, self.ttl)
+
+    def clear(self):
+        cache = caches[self.alias]
+        try:
+            generation = cache.incr(self.__generation_key)
+        except ValueError:
+            generation = 1
+            cache.set(self.__generation_key, generation, None)
+        self._generation = generation
+        self._generation_checked_at = time.monotonic()
+
+    @property
+    def generation(self) -> int:
+        now = time.monotonic()
+        if self._generation is None or now - self._generation_checked_at > GENERATION_CHECK_SECONDS:
+            self._generation = caches[self.alias].get(self.__generation_key, 0)
+            self._generation_checked_at = now
+        return self._generation
+
+    @property
+    def __generation_key(self) -> str:
+        return self.prefix + "generation"
+
+    def __cache_key(self, key: str) -> str:
+        return f"{self.prefix}{self.generation}:{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
+
+
+class GuessMemo:
+    def __init__(self, store) -> None:
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def blocking(self) -> bool:
+        return self.store.blocking
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_or_compute(self, key: str, compute):
+        value = self.store.get(key)
+        if value is not None:
+            self.hits += 1
+            metrics.increment("guess_memo_hits")
+            return value
+
+        self.misses += 1
+        metrics.increment("guess_memo_misses")
+        value = compute()
+        self.store.set(key, value)
+        return value
+
+    def clear(self):
+        self.store.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def value_size(value) -> int:
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(value_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def create_store():
+    if settings.GUESSAPP_MEMO_BACKEND == "local":
+        return LocalMemoStore(settings.GUESSAPP_MEMO_SIZE, settings.GUESSAPP_MEMO_TTL, settings.GUESSAPP_MEMO_BYTES)
+    return DjangoCacheMemoStore(settings.GUESSAPP_MEMO_BACKEND, settings.GUESSAPP_MEMO_TTL)
+
+
+guess_memo = GuessMemo(create_store())
@@ -0,0 +1,99 @@
+from contextlib import nullcontext
+import threading
+import time
+
+from django.conf import settings
+
+
+NULL_TIMER = nullcontext()
+
+
+class Timer:
+    def __init__(self, metrics: "Metrics", name: str, phase: str) -> None:
+        self._metrics = metrics
+        self._name = name
+        self._phase = phase
+
+    def __enter__(self):
+        self._start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._metrics.observe(self._name, time.perf_counter() - self._start_time, self._phase)
+
+
+class Metrics:
+    def __init__(self, enabled: bool) -> None:
+        self.enabled = enabled
+        self._counters = {}
+        self._summaries = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, phase: str = None):
+        if not self.enabled:
+            return
+        with self._lock:
+            key = (name, phase)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, phase: str = None):
+        if not self.enabled:
+            return
+        with self._lock:
+            count, total = self._summaries.get((name, phase), (0, 0.0))
+            self._summaries[(name, phase)] = (count + 1, total + value)
+
+    def timer(self, name: str, phase: str = None):
+        if not self.enabled:
+            return NULL_TIMER
+        return Timer(self, name, phase)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            summaries = dict(self._summaries)
+
+        snapshot = {}
+        for (name, phase), value in sorted(counters.items(), key=_sort_key):
+            snapshot.setdefault(name, {})[phase or "total"] = value
+        for (name, phase), (count, total) in sorted(summaries.items(), key=_sort_key):
+            snapshot.setdefault(name, {})[phase or "total"] = {"count": count, "sum": total}
+        return snapshot
+
+    def prometheus(self) -> str:
+        with self._lock:
+            counters = dict(self._counters)
+            summaries = dict(self._summaries)
+
+        lines = []
+        for name in sorted({name for name, _ in counters}):
+            lines.append(f"# TYPE guessapp_{name}_total counter")
+            for (counter_name, phase), value in sorted(counters.items(), key=_sort_key):
+                if counter_name == name:
+                    lines.append(f"guessapp_{name}_total{_labels(phase)} {value}")
+
+        for name in sorted({name for name, _ in summaries}):
+            lines.append(f"# TYPE guessapp_{name} summary")
+            for (summary_name, phase), (count, total) in sorted(summaries.items(), key=_sort_key):
+                if summary_name == name:
+                    lines.append(f"guessapp_{name}_count{_labels(phase)} {count}")
+                    lines.append(f"guessapp_{name}_sum{_labels(phase)} {total}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _sort_key(item) -> tuple:
+    (name, phase), _ = item
+    return name, phase or ""
+
+
+def _labels(phase: str) -> str:
+    return f'{{phase="{phase}"}}' if phase else ""
+
+
+metrics = Metrics(settings.GUESSAPP_METRICS)
@@ -0,0 +1,67 @@
+import asyncio
+from contextvars import ContextVar
+import time
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.utils.decorators import sync_and_async_middleware
+
+from guessapp.metrics import metrics
+
+
+@sync_and_async_middleware
+def query_metrics_middleware(get_response):
+    if not metrics.enabled:
+        raise MiddlewareNotUsed()
+
+    if asyncio.iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            queries = QueryCounter()
+            token = request_queries.set(queries)
+            start_time = time.perf_counter()
+            try:
+                with connection.execute_wrapper(queries):
+                    response = await get_response(request)
+            finally:
+                request_queries.reset(token)
+            observe_request(time.perf_counter() - start_time, queries)
+            return response
+
+    else:
+
+        def middleware(request):
+            queries = QueryCounter()
+            start_time = time.perf_counter()
+            with connection.execute_wrapper(queries):
+                response = get_response(request)
+            observe_request(time.perf_counter() - start_time, queries)
+            return response
+
+    return middleware
+
+
+def observe_request(elapsed_time: float, queries: "QueryCounter"):
+    metrics.observe("request_seconds", elapsed_time)
+    metrics.observe("db_queries_per_request", queries.count)
+    metrics.observe("db_seconds_per_request", queries.seconds)
+
+
+class QueryCounter:
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        metrics.increment("db_queries")
+        start_time = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_time = time.perf_counter() - start_time
+            self.seconds += elapsed_time
+            metrics.observe("db_query_seconds", elapsed_time)
+
+
+request_queries = ContextVar("request_queries", default=None)
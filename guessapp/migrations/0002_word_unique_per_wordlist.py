@@ -0,0 +1,19 @@
+# Generated by Django 4.1.13 on 2026-10-18 05:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("guessapp", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="word",
+            constraint=models.UniqueConstraint(
+                fields=("wordlist", "word"), name="unique_wordlist_word"
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.1.13 on 2026-10-18 05:24
+
+from django.db import migrations, models
+from django.db.models.functions import Length
+
+
+def populate_length(apps, schema_editor):
+    Word = apps.get_model("guessapp", "Word")
+    Word.objects.update(length=Length("word"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("guessapp", "0002_word_unique_per_wordlist"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="word",
+            name="length",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_length, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="word",
+            index=models.Index(
+                fields=["wordlist", "length", "-rating"], name="word_length_rating_idx"
+            ),
+        ),
+    ]
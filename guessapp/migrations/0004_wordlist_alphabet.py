@@ -0,0 +1,18 @@
+# Generated by Django 4.1.13 on 2026-10-18 05:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("guessapp", "0003_word_length"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="wordlist",
+            name="alphabet",
+            field=models.CharField(blank=True, default="", max_length=20),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.1.13 on 2026-10-18 05:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("guessapp", "0004_wordlist_alphabet"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WordlistHistogram",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("length", models.PositiveSmallIntegerField()),
+                ("positions", models.JSONField(default=dict)),
+                (
+                    "wordlist",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="histograms",
+                        to="guessapp.wordlist",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="wordlisthistogram",
+            constraint=models.UniqueConstraint(
+                fields=("wordlist", "length"), name="unique_wordlist_histogram_length"
+            ),
+        ),
+    ]
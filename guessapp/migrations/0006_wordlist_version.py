@@ -0,0 +1,18 @@
+# Generated by Django 4.1.13 on 2026-10-18 06:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("guessapp", "0005_wordlist_histogram"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="wordlist",
+            name="version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
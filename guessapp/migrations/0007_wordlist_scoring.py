@@ -0,0 +1,18 @@
+# Generated by Django 4.1.13 on 2026-10-18 07:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("guessapp", "0006_wordlist_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="wordlist",
+            name="scoring",
+            field=models.CharField(default="frequency", max_length=20),
+        ),
+    ]
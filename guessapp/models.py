@@ -8,6 +8,9 @@ CharField.register_lookup(Length, "length")
 
 class Wordlist(models.Model):
     name = models.CharField(max_length=100, unique=True)
+    alphabet = models.CharField(max_length=20, blank=True, default="")
+    version = models.PositiveIntegerField(default=0)
+    scoring = models.CharField(max_length=20, default="frequency")
 
 
 class Word(models.Model):
@@ -16,3 +19,27 @@ class Word(models.Model):
     )
     word = models.CharField(max_length=100)
     rating = models.IntegerField()
+    length = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["wordlist", "word"], name="unique_wordlist_word"),
+        ]
+        indexes = [
+            models.Index(fields=["wordlist", "length", "-rating"], name="word_length_rating_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.length = len(self.word)
+        super().save(*args, **kwargs)
+
+
+class WordlistHistogram(models.Model):
+    wordlist = models.ForeignKey(Wordlist, on_delete=models.CASCADE, related_name="histograms")
+    length = models.PositiveSmallIntegerField()
+    positions = models.JSONField(default=dict)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["wordlist", "length"], name="unique_wordlist_histogram_length"),
+        ]
@@ -0,0 +1,140 @@
+import os
+from pathlib import Path
+import struct
+import threading
+
+from django.conf import settings
+import numpy as np
+
+from guessapp.feedback import DEFAULT_CHUNK_BYTES, feedback_matrix
+from guessapp.index import WordIndex
+from guessapp.patterns import PatternMatrix
+from guessapp.recommender import Recommender
+
+
+MAGIC = b"WGOB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHBI32sId")
+HEADER_SIZE = 64
+ENTRY = np.dtype([("pattern", "<u4"), ("guess", "<u4"), ("entropy", "<f8")])
+DEFAULT_RESPONSES = 100
+
+
+class OpeningBook:
+    def __init__(self, opening: str, entropy: float, responses: dict = {}, hard_mode: bool = False) -> None:
+        self.opening = opening
+        self.entropy = entropy
+        self.responses = responses
+        self.hard_mode = hard_mode
+
+    def lookup(self, turns: list) -> tuple:
+        if not turns:
+            return self.opening, self.entropy
+        if len(turns) == 1 and turns[0][0] == self.opening:
+            return self.responses.get(turns[0][1])
+        return None
+
+    @classmethod
+    def build(
+        cls,
+        index: WordIndex,
+        responses: int = DEFAULT_RESPONSES,
+        hard_mode: bool = False,
+        pattern_matrix: PatternMatrix = None,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    ) -> "OpeningBook":
+        recommender = Recommender(index, chunk_bytes, pattern_matrix)
+        ((opening, entropy),) = recommender.recommend(index.all, 1, hard_mode)
+        opening_idx = index.find(opening)
+        if pattern_matrix is not None:
+            row = np.asarray(pattern_matrix.row(opening_idx))
+        else:
+            row = feedback_matrix(index.codes[opening_idx, None], index.codes, chunk_bytes, len(index.alphabet))[0]
+
+        patterns, counts = np.unique(row, return_counts=True)
+        book = {}
+        for pattern in patterns[np.argsort(-counts, kind="stable")][:responses].tolist():
+            survivors = index.mask(np.flatnonzero(row == pattern).tolist())
+            ((guess, guess_entropy),) = recommender.recommend(survivors, 1, hard_mode)
+            book[pattern] = (guess, guess_entropy)
+        return cls(opening, entropy, book, hard_mode)
+
+    def dumps(self, index: WordIndex) -> bytes:
+        entries = np.array(
+            [(pattern, index.find(guess), entropy) for pattern, (guess, entropy) in sorted(self.responses.items())],
+            dtype=ENTRY,
+        )
+        header = HEADER.pack(
+            MAGIC,
+            VERSION,
+            index.word_length,
+            self.hard_mode,
+            len(entries),
+            index.fingerprint,
+            index.find(self.opening),
+            self.entropy,
+        )
+        return header.ljust(HEADER_SIZE, b"\0") + entries.tobytes()
+
+    @classmethod
+    def loads(cls, data: bytes, index: WordIndex) -> "OpeningBook":
+        if len(data) < HEADER_SIZE:
+            raise ValueError("Not an opening book")
+
+        magic, version, word_length, hard_mode, count, fingerprint, opening, entropy = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not an opening book")
+        if version != VERSION:
+            raise ValueError(f"Unsupported opening book version {version}")
+        if word_length != index.word_length or fingerprint != index.fingerprint:
+            raise ValueError("Opening book does not match the word index")
+
+        entries = np.frombuffer(data, dtype=ENTRY, count=count, offset=HEADER_SIZE)
+        responses = {
+            pattern: (index[guess], entropy)
+            for pattern, guess, entropy in zip(
+                entries["pattern"].tolist(), entries["guess"].tolist(), entries["entropy"].tolist()
+            )
+        }
+        return cls(index[opening], entropy, responses, bool(hard_mode))
+
+
+class OpeningBookStore:
+    def __init__(self) -> None:
+        self._books = {}
+        self._lock = threading.Lock()
+
+    def get(self, index: WordIndex, hard_mode: bool = False) -> OpeningBook:
+        key = (index.fingerprint, hard_mode)
+        with self._lock:
+            if key in self._books:
+                return self._books[key]
+
+        try:
+            book = OpeningBook.loads(opening_book_path(index, hard_mode).read_bytes(), index)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        with self._lock:
+            return self._books.setdefault(key, book)
+
+    def invalidate(self):
+        with self._lock:
+            self._books.clear()
+
+
+opening_books = OpeningBookStore()
+
+
+def opening_book_path(index: WordIndex, hard_mode: bool = False) -> Path:
+    mode = "-hard" if hard_mode else ""
+    return Path(settings.GUESSAPP_DATA_DIR) / f"openings-{index.word_length}-{index.fingerprint.hex()[:16]}{mode}.wgob"
+
+
+def write_opening_book(book: OpeningBook, index: WordIndex) -> Path:
+    path = opening_book_path(index, book.hard_mode)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(book.dumps(index))
+    os.replace(tmp_path, path)
+    return path
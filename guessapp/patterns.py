@@ -0,0 +1,92 @@
+import os
+from pathlib import Path
+import struct
+import threading
+
+from django.conf import settings
+import numpy as np
+
+from guessapp.feedback import DEFAULT_CHUNK_BYTES, chunks, feedback_matrix, pattern_dtype
+from guessapp.index import WordIndex
+
+
+MAGIC = b"WGPM"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ32s")
+HEADER_SIZE = 64
+
+
+class PatternMatrix:
+    def __init__(self, matrix: np.ndarray) -> None:
+        self.matrix = matrix
+
+    def row(self, guess_idx: int) -> np.ndarray:
+        return self.matrix[guess_idx]
+
+    def matching(self, guess_idx: int, pattern: int) -> int:
+        bits = np.packbits(self.matrix[guess_idx] == pattern, bitorder="little")
+        return int.from_bytes(bits.tobytes(), "little")
+
+    @classmethod
+    def load(cls, path: Path, index: WordIndex) -> "PatternMatrix":
+        with open(path, "rb") as file:
+            magic, version, word_length, word_count, fingerprint = HEADER.unpack(file.read(HEADER.size))
+
+        if magic != MAGIC:
+            raise ValueError(f"Not a pattern matrix file: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported pattern matrix version {version} in {path}")
+        if word_length != index.word_length or word_count != len(index) or fingerprint != index.fingerprint:
+            raise ValueError(f"Pattern matrix {path} does not match the word index")
+
+        matrix = np.memmap(
+            path, dtype=pattern_dtype(word_length), mode="r", offset=HEADER_SIZE, shape=(word_count, word_count)
+        )
+        return cls(matrix)
+
+
+class PatternMatrixStore:
+    def __init__(self) -> None:
+        self._matrices = {}
+        self._lock = threading.Lock()
+
+    def get(self, index: WordIndex) -> PatternMatrix:
+        key = index.fingerprint
+        with self._lock:
+            if key in self._matrices:
+                return self._matrices[key]
+
+        try:
+            matrix = PatternMatrix.load(pattern_matrix_path(index), index)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        with self._lock:
+            return self._matrices.setdefault(key, matrix)
+
+    def invalidate(self):
+        with self._lock:
+            self._matrices.clear()
+
+
+pattern_matrices = PatternMatrixStore()
+
+
+def pattern_matrix_path(index: WordIndex) -> Path:
+    return Path(settings.GUESSAPP_DATA_DIR) / f"patterns-{index.word_length}-{index.fingerprint.hex()[:16]}.wgpm"
+
+
+def write_pattern_matrix(path: Path, index: WordIndex, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> int:
+    codes = index.codes
+    alphabet_size = len(index.alphabet)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+
+    with open(tmp_path, "wb") as file:
+        header = HEADER.pack(MAGIC, VERSION, index.word_length, len(index), index.fingerprint)
+        file.write(header.ljust(HEADER_SIZE, b"\0"))
+        for start, end in chunks(len(codes), len(codes) * index.word_length, chunk_bytes):
+            file.write(feedback_matrix(codes[start:end], codes, chunk_bytes, alphabet_size).tobytes())
+    os.replace(tmp_path, path)
+
+    return path.stat().st_size
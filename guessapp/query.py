@@ -0,0 +1,144 @@
+from dataclasses import dataclass
+import json
+
+from guessapp.index import WordIndex
+
+
+@dataclass(frozen=True)
+class GuessQuery:
+    word_length: int
+    excluded_characters: frozenset = frozenset()
+    safe_characters: tuple = ()
+    characters_anywhere: tuple = ()
+    characters_excluded_at: tuple = ()
+
+    @classmethod
+    def compile(
+        cls,
+        word_length: int,
+        excluded_characters: list = [],
+        safe_characters: dict = {},
+        characters_anywhere: dict = {},
+        characters_excluded_at: dict = {},
+    ) -> "GuessQuery":
+        validate_excluded_characters(excluded_characters)
+        validate_safe_characters(safe_characters, word_length)
+        validate_characters_anywhere(characters_anywhere, word_length)
+        validate_characters_excluded_at(characters_excluded_at, word_length)
+
+        return cls(
+            word_length,
+            frozenset(excluded_characters),
+            tuple(sorted(safe_characters.items())),
+            tuple(sorted(characters_anywhere.items())),
+            tuple(sorted((char, tuple(sorted(set(idx_list)))) for char, idx_list in characters_excluded_at.items())),
+        )
+
+    @property
+    def key(self) -> str:
+        return json.dumps(
+            [
+                self.word_length,
+                sorted(self.excluded_characters),
+                self.safe_characters,
+                self.characters_anywhere,
+                self.characters_excluded_at,
+            ],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+
+    def filter(self, index: WordIndex) -> int:
+        if index.word_length != self.word_length:
+            raise ValueError(
+                f"Query for word length {self.word_length} cannot filter index of length {index.word_length}"
+            )
+
+        return index.filter(
+            self.excluded_characters,
+            dict(self.safe_characters),
+            dict(self.characters_anywhere),
+            dict(self.characters_excluded_at),
+        )
+
+
+def validate_excluded_characters(excluded_characters: list):
+    for char in excluded_characters:
+        if not char:
+            raise ValueError("Missing character in exluded_chars list")
+
+        if len(char) != 1:
+            raise ValueError("Only one character per exclusion allowed in exluded_chars list")
+
+
+def validate_safe_characters(safe_characters: dict, word_length: int):
+    reserved = {}
+    for char, idx in safe_characters.items():
+        if not char:
+            raise ValueError("Missing character in safe_characters dict")
+
+        if len(char) != 1:
+            raise ValueError("Only one character per safe character allowed in safe_characters dict")
+
+        if idx is None:
+            raise ValueError(f'Missing index in safe_characters for character "{char}"')
+
+        if not isinstance(idx, int):
+            raise TypeError(f'Type of index is not integer of safe_characters character "{char}"')
+
+        if idx < 0 or idx > word_length - 1:
+            raise IndexError(f'Index of safe character "{char}" out of bounds')
+
+        if idx in reserved:
+            raise ValueError(f'Safe character "{char}" index is already reserved by "{reserved[idx]}"')
+
+        reserved[idx] = char
+
+
+def validate_characters_anywhere(characters_anywhere: dict, word_length: int):
+    for char, occurences in characters_anywhere.items():
+        if not char:
+            raise ValueError("Missing character in characters_anywhere dict")
+
+        if len(char) != 1:
+            raise ValueError("Only one character per anywhere character allowed in characters_anywhere dict")
+
+        if occurences is None:
+            raise ValueError(f'No occurences defined in safe_characters for character "{char}"')
+
+        if not isinstance(occurences, int):
+            raise TypeError(f'Type of amount of occurences is not integer of safe_characters character "{char}"')
+
+        if occurences < 1:
+            raise ValueError(f'Occurences of anywhere character "{char}" have to be at least 1')
+
+        if occurences > word_length:
+            raise ValueError(
+                f'Occurences of anywhere character "{char}" cannot exceed the amount of word character count '
+                f"{word_length}"
+            )
+
+
+def validate_characters_excluded_at(characters_excluded_at: dict, word_length: int):
+    for char, idx_list in characters_excluded_at.items():
+        if not char:
+            raise ValueError("Missing character in characters_excluded_at dict")
+
+        if len(char) != 1:
+            raise ValueError("Only one character per exclusion allowed in characters_excluded_at dict")
+
+        if not idx_list:
+            raise ValueError(f'Missing list of indices for characters_excluded_at character "{char}"')
+
+        if not isinstance(idx_list, list):
+            raise TypeError(f'Type of indices for characters_excluded_at is not list for character "{char}"')
+
+        for idx in idx_list:
+            if idx is None:
+                raise ValueError(f'Missing index for characters_excluded_at character "{char}"')
+
+            if not isinstance(idx, int):
+                raise TypeError(f'Type of index for characters_excluded_at is not integer for character "{char}"')
+
+            if idx < 0 or idx > word_length - 1:
+                raise IndexError(f'Index of characters_excluded_at character "{char}" out of bounds')
@@ -0,0 +1,76 @@
+import numpy as np
+
+from guessapp.feedback import DEFAULT_CHUNK_BYTES, chunks, feedback_matrix
+from guessapp.index import WordIndex
+from guessapp.patterns import PatternMatrix
+
+
+MAX_BINCOUNT_SIZE = 16 * 1024 * 1024
+
+
+class Recommender:
+    def __init__(
+        self, index: WordIndex, chunk_bytes: int = DEFAULT_CHUNK_BYTES, pattern_matrix: PatternMatrix = None
+    ) -> None:
+        self._index = index
+        self._chunk_bytes = chunk_bytes
+        self._pattern_matrix = pattern_matrix
+
+    @property
+    def codes(self) -> np.ndarray:
+        return self._index.codes
+
+    def scores(self, candidates: int, guesses: int = None) -> tuple:
+        candidate_indices = self.__indices(candidates)
+        guess_indices = self.__indices(self._index.all if guesses is None else guesses)
+        entropies = np.zeros(len(guess_indices), dtype=np.float64)
+        if len(candidate_indices) == 0:
+            return guess_indices, entropies
+
+        if self._pattern_matrix is not None:
+            matrix = self._pattern_matrix.matrix
+            for start, end in chunks(len(guess_indices), matrix.shape[1] * matrix.itemsize, self._chunk_bytes):
+                patterns = matrix[guess_indices[start:end]][:, candidate_indices]
+                entropies[start:end] = pattern_entropies(patterns, self._index.word_length)
+            return guess_indices, entropies
+
+        answers = self.codes[candidate_indices]
+        alphabet_size = len(self._index.alphabet)
+        row_bytes = len(candidate_indices) * self._index.word_length
+        for start, end in chunks(len(guess_indices), row_bytes, self._chunk_bytes):
+            guesses = self.codes[guess_indices[start:end]]
+            patterns = feedback_matrix(guesses, answers, self._chunk_bytes, alphabet_size)
+            entropies[start:end] = pattern_entropies(patterns, self._index.word_length)
+        return guess_indices, entropies
+
+    def recommend(self, candidates: int, limit: int = 10, hard_mode: bool = False) -> list:
+        guess_indices, entropies = self.scores(candidates, candidates if hard_mode else None)
+        is_candidate = np.isin(guess_indices, self.__indices(candidates))
+        order = np.lexsort((guess_indices, ~is_candidate, -entropies))[:limit]
+        return [(self._index[guess_indices[idx]], float(entropies[idx])) for idx in order]
+
+    def __indices(self, mask: int) -> np.ndarray:
+        return np.fromiter(self._index.indices(mask), dtype=np.int64)
+
+
+def pattern_entropies(patterns: np.ndarray, word_length: int) -> np.ndarray:
+    rows, answer_count = patterns.shape
+    pattern_count = 3**word_length
+
+    if rows * pattern_count <= MAX_BINCOUNT_SIZE:
+        offsets = np.arange(rows, dtype=np.int64)[:, None] * pattern_count
+        counts = np.bincount((patterns + offsets).ravel(), minlength=rows * pattern_count)
+        return _entropies(counts.reshape(rows, pattern_count), answer_count)
+
+    entropies = np.empty(rows, dtype=np.float64)
+    for row, row_patterns in enumerate(patterns):
+        _, counts = np.unique(row_patterns, return_counts=True)
+        entropies[row] = _entropies(counts[None, :], answer_count)[0]
+    return entropies
+
+
+def _entropies(counts: np.ndarray, answer_count: int) -> np.ndarray:
+    probabilities = counts / answer_count
+    with np.errstate(divide="ignore", invalid="ignore"):
+        information = np.where(counts > 0, probabilities * np.log2(probabilities), 0.0)
+    return -information.sum(axis=1)
@@ -0,0 +1,53 @@
+import numpy as np
+
+from guessapp.feedback import encode_words
+
+
+def dense_codes(text: str, word_length: int) -> tuple:
+    codepoints = encode_words(text, word_length)
+    if codepoints.size == 0:
+        return codepoints.astype(np.int64), 0
+
+    present = np.bincount(codepoints.ravel()) > 0
+    mapping = np.cumsum(present) - 1
+    return mapping[codepoints], int(present.sum())
+
+
+def frequency_ratings(codes: np.ndarray, alphabet_size: int) -> np.ndarray:
+    counts = np.bincount(codes.ravel(), minlength=alphabet_size)
+    ordered = np.sort(codes, axis=1)
+    first = np.ones(ordered.shape, dtype=bool)
+    first[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    return (counts[ordered] * first).sum(axis=1)
+
+
+def positional_ratings(codes: np.ndarray, alphabet_size: int) -> np.ndarray:
+    ratings = np.zeros(len(codes), dtype=np.int64)
+    for idx in range(codes.shape[1]):
+        counts = np.bincount(codes[:, idx], minlength=alphabet_size)
+        ratings += counts[codes[:, idx]]
+    return ratings
+
+
+def bigram_ratings(codes: np.ndarray, alphabet_size: int) -> np.ndarray:
+    if codes.shape[1] < 2:
+        return np.zeros(len(codes), dtype=np.int64)
+
+    bigrams = codes[:, :-1] * alphabet_size + codes[:, 1:]
+    counts = np.bincount(bigrams.ravel(), minlength=alphabet_size * alphabet_size)
+    return counts[bigrams].sum(axis=1)
+
+
+SCORING_MODELS = {
+    "frequency": frequency_ratings,
+    "positional": positional_ratings,
+    "bigram": bigram_ratings,
+}
+
+
+def rate_words(words: list, word_length: int, model: str = "frequency") -> np.ndarray:
+    if model not in SCORING_MODELS:
+        raise ValueError(f'Unknown scoring model "{model}"')
+
+    codes, alphabet_size = dense_codes("".join(words), word_length)
+    return SCORING_MODELS[model](codes, alphabet_size)
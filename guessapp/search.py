@@ -0,0 +1,189 @@
+from collections import Counter
+from dataclasses import dataclass
+import json
+import re
+
+from guessapp.index import WordIndex
+
+
+WILDCARDS = "_?."
+
+STAR = "*"
+
+INDEX = "index"
+
+SCAN = "scan"
+
+
+@dataclass(frozen=True)
+class PatternQuery:
+    pattern: str = ""
+    contains: tuple = ()
+    counts: tuple = ()
+    regex: str = ""
+
+    @classmethod
+    def compile(cls, pattern: str = "", contains: str = "", counts: dict = {}, regex: str = "") -> "PatternQuery":
+        if not isinstance(pattern, str) or not isinstance(contains, str) or not isinstance(regex, str):
+            raise ValueError("pattern, contains and regex have to be strings")
+        parse_pattern(pattern)
+        validate_counts(counts)
+        try:
+            re.compile(regex)
+        except re.error as e:
+            raise ValueError(f"Invalid regex: {e}")
+
+        return cls(pattern, tuple(sorted(Counter(contains).items())), tuple(sorted(counts.items())), regex)
+
+    @property
+    def key(self) -> str:
+        return json.dumps(
+            [self.pattern, self.contains, self.counts, self.regex], ensure_ascii=False, separators=(",", ":")
+        )
+
+    @property
+    def tokens(self) -> list:
+        return parse_pattern(self.pattern)
+
+    @property
+    def segments(self) -> list:
+        tokens = self.tokens
+        if STAR not in tokens:
+            return []
+
+        first = tokens.index(STAR)
+        last = _last_star(tokens)
+        segments = [[]]
+        for token in tokens[first:last]:
+            if token != STAR:
+                segments[-1].append(token)
+            elif segments[-1]:
+                segments.append([])
+        return [segment for segment in segments if segment]
+
+    @property
+    def scan_patterns(self) -> list:
+        patterns = []
+        if len(self.segments) > 1:
+            patterns.append(re.compile(pattern_regex(self.tokens)))
+        if self.regex:
+            patterns.append(re.compile(self.regex))
+        return patterns
+
+    def filter(self, index: WordIndex, mask: int = None) -> tuple:
+        result = index.all if mask is None else mask
+
+        for char, occurences in self.contains:
+            result &= index.count_mask(char, occurences)
+
+        for char, occurences in self.counts:
+            result &= index.count_mask(char, occurences) & ~index.count_mask(char, occurences + 1)
+
+        positions = self.__positions(index.word_length)
+        if positions is None:
+            return 0, INDEX
+        for idx, token in positions:
+            result &= self.__position_mask(index, idx, token)
+
+        segments = self.segments
+        if len(segments) == 1:
+            result &= self.__segment_mask(index, segments[0])
+
+        scan_patterns = self.scan_patterns
+        if not scan_patterns:
+            return result, INDEX
+
+        matches = (idx for idx in index.indices(result) if all(p.fullmatch(index[idx]) for p in scan_patterns))
+        return index.mask(matches), SCAN
+
+    def __positions(self, word_length: int) -> list:
+        tokens = self.tokens
+        if STAR not in tokens:
+            if tokens and len(tokens) != word_length:
+                raise ValueError(f"Pattern {self.pattern} does not match word length {word_length}")
+            return list(enumerate(tokens))
+
+        first = tokens.index(STAR)
+        last = _last_star(tokens)
+        suffix = tokens[last:]
+        if first + len(suffix) > word_length:
+            return None
+        return list(enumerate(tokens[:first])) + list(enumerate(suffix, word_length - len(suffix)))
+
+    def __segment_mask(self, index: WordIndex, segment: list) -> int:
+        tokens = self.tokens
+        first = tokens.index(STAR)
+        last = index.word_length - (len(tokens) - _last_star(tokens)) - len(segment)
+        mask = 0
+        for start in range(first, last + 1):
+            segment_mask = index.all
+            for idx, token in enumerate(segment, start):
+                segment_mask &= self.__position_mask(index, idx, token)
+            mask |= segment_mask
+        return mask
+
+    def __position_mask(self, index: WordIndex, idx: int, token: tuple) -> int:
+        if token is None:
+            return index.all
+
+        negated, chars = token
+        mask = 0
+        for char in chars:
+            mask |= index.position_mask(idx, char)
+        return index.all & ~mask if negated else mask
+
+
+def parse_pattern(pattern: str) -> list:
+    tokens = []
+    idx = 0
+    while idx < len(pattern):
+        char = pattern[idx]
+        if char in WILDCARDS:
+            tokens.append(None)
+        elif char == STAR:
+            tokens.append(STAR)
+        elif char == "[":
+            end = pattern.find("]", idx + 1)
+            if end == -1:
+                raise ValueError(f"Unterminated character class in pattern {pattern}")
+            start = idx + 1
+            chars = pattern[start:end]
+            negated = chars.startswith("^")
+            chars = frozenset(chars[1:] if negated else chars)
+            if not chars:
+                raise ValueError(f"Empty character class in pattern {pattern}")
+            tokens.append((negated, chars))
+            idx = end
+        else:
+            tokens.append((False, frozenset(char)))
+        idx += 1
+    return tokens
+
+
+def _last_star(tokens: list) -> int:
+    return len(tokens) - tokens[::-1].index(STAR)
+
+
+def pattern_regex(tokens: list) -> str:
+    parts = []
+    for token in tokens:
+        if token is None:
+            parts.append(".")
+        elif token == STAR:
+            parts.append(".*")
+        else:
+            negated, chars = token
+            parts.append(f"[{'^' if negated else ''}{''.join(re.escape(char) for char in sorted(chars))}]")
+    return "".join(parts)
+
+
+def validate_counts(counts: dict):
+    if not isinstance(counts, dict):
+        raise ValueError("counts has to be a dict")
+
+    for char, occurences in counts.items():
+        if len(char) != 1:
+            raise ValueError("Only one character per key allowed in counts dict")
+
+        if not isinstance(occurences, int) or isinstance(occurences, bool) or occurences < 0:
+            raise ValueError(f'Occurences of "{char}" in counts dict have to be a non-negative integer')
@@ -0,0 +1,164 @@
+import struct
+import zlib
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+from guessapp.cache import index_cache
+from guessapp.feedback import GREEN, GREY, decode_pattern, feedback_pattern
+from guessapp.index import WordIndex
+from guessapp.openings import opening_books
+from guessapp.patterns import pattern_matrices
+from guessapp.recommender import Recommender
+
+
+VERSION = 1
+HEADER = struct.Struct("<BBH32sIH")
+SCAN_THRESHOLD = 128
+CACHE_PREFIX = "guessapp:session:"
+INDICES = 0
+BITSET = 1
+
+
+class StaleSession(ValueError):
+    pass
+
+
+class SolverSession:
+    def __init__(self, wordlist_name: str, index: WordIndex, survivors: int = None, turns: list = None) -> None:
+        self.wordlist_name = wordlist_name
+        self.index = index
+        self.survivors = index.all if survivors is None else survivors
+        self.turns = list(turns or [])
+
+    @classmethod
+    def start(cls, wordlist_name: str, word_length: int) -> "SolverSession":
+        return cls(wordlist_name, index_cache.get(wordlist_name, word_length))
+
+    def __len__(self) -> int:
+        return self.survivors.bit_count()
+
+    def words(self) -> list:
+        return self.index.words(self.survivors)
+
+    def suggest(self, hard_mode: bool = False) -> str:
+        book = opening_books.get(self.index, hard_mode)
+        if book is not None:
+            response = book.lookup(self.turns)
+            if response is not None:
+                return response[0]
+
+        pattern_matrix = pattern_matrices.get(self.index)
+        recommender = Recommender(self.index, pattern_matrix=pattern_matrix)
+        return recommender.recommend(self.survivors, limit=1, hard_mode=hard_mode)[0][0]
+
+    def apply(self, guess: str, pattern: int) -> int:
+        if len(guess) != self.index.word_length:
+            raise ValueError(f'Guess "{guess}" does not have length {self.index.word_length}')
+        if pattern < 0 or pattern >= 3**self.index.word_length:
+            raise ValueError(f"Feedback pattern {pattern} out of range")
+
+        if len(self) <= SCAN_THRESHOLD:
+            indices = self.index.indices(self.survivors)
+            self.survivors = self.index.mask(
+                idx for idx in indices if feedback_pattern(guess, self.index[idx]) == pattern
+            )
+        else:
+            self.survivors &= self.__mask(guess, pattern)
+
+        self.turns.append((guess, pattern))
+        return len(self)
+
+    def __mask(self, guess: str, pattern: int) -> int:
+        guess_idx = self.index.find(guess)
+        if guess_idx >= 0:
+            pattern_matrix = pattern_matrices.get(self.index)
+            if pattern_matrix is not None:
+                return pattern_matrix.matching(guess_idx, pattern)
+        return feedback_mask(self.index, guess, pattern)
+
+    def dumps(self) -> bytes:
+        count = len(self)
+        if count * 32 < len(self.index):
+            encoding = INDICES
+            survivors = struct.pack(f"<{count}I", *self.index.indices(self.survivors))
+        else:
+            encoding = BITSET
+            survivors = self.survivors.to_bytes((len(self.index) + 7) // 8, "little")
+
+        name = self.wordlist_name.encode("utf-8")
+        header = HEADER.pack(VERSION, encoding, self.index.word_length, self.index.fingerprint, count, len(name))
+        turn = struct.Struct(f"<{4 * self.index.word_length}sI")
+        turns = b"".join(turn.pack(guess.encode("utf-32-le"), pattern) for guess, pattern in self.turns)
+        return zlib.compress(header + name + struct.pack("<H", len(self.turns)) + turns + survivors)
+
+    @classmethod
+    def loads(cls, data: bytes, index: WordIndex = None) -> "SolverSession":
+        data = zlib.decompress(data)
+        version, encoding, word_length, fingerprint, count, name_length = HEADER.unpack_from(data)
+        if version != VERSION:
+            raise StaleSession(f"Unsupported session version {version}")
+
+        offset = HEADER.size
+        (name,) = struct.unpack_from(f"<{name_length}s", data, offset)
+        offset += name_length
+        (turn_count,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+
+        turn = struct.Struct(f"<{4 * word_length}sI")
+        turns = []
+        for _ in range(turn_count):
+            guess, pattern = turn.unpack_from(data, offset)
+            turns.append((guess.decode("utf-32-le"), pattern))
+            offset += turn.size
+        wordlist_name = name.decode("utf-8")
+
+        if index is None:
+            index = index_cache.get(wordlist_name, word_length)
+
+        if index.fingerprint != fingerprint:
+            session = cls(wordlist_name, index)
+            for guess, pattern in turns:
+                session.apply(guess, pattern)
+            return session
+
+        if encoding == INDICES:
+            survivors = index.mask(struct.unpack_from(f"<{count}I", data, offset))
+        else:
+            survivors = int.from_bytes(data[offset:], "little")
+        return cls(wordlist_name, index, survivors, turns)
+
+    def save(self, key: str, timeout: int = DEFAULT_TIMEOUT):
+        cache.set(CACHE_PREFIX + key, self.dumps(), timeout)
+
+    @classmethod
+    def load(cls, key: str) -> "SolverSession":
+        data = cache.get(CACHE_PREFIX + key)
+        if data is None:
+            return None
+        return cls.loads(data)
+
+
+def feedback_mask(index: WordIndex, guess: str, pattern: int) -> int:
+    mask = index.all
+    found = {}
+    greyed = set()
+
+    for idx, (char, mark) in enumerate(zip(guess, decode_pattern(pattern, index.word_length))):
+        if mark == GREEN:
+            mask &= index.position_mask(idx, char)
+        else:
+            mask &= ~index.position_mask(idx, char)
+
+        if mark == GREY:
+            greyed.add(char)
+        else:
+            found[char] = found.get(char, 0) + 1
+
+    for char in set(guess):
+        occurences = found.get(char, 0)
+        mask &= index.count_mask(char, occurences)
+        if char in greyed:
+            mask &= ~index.count_mask(char, occurences + 1)
+
+    return mask
@@ -0,0 +1,126 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import time
+
+import numpy as np
+
+from guessapp.feedback import feedback_pattern
+from guessapp.index import WordIndex
+from guessapp.session import SolverSession
+
+
+STRATEGIES = ("entropy", "rank")
+
+DEFAULT_MAX_TURNS = 20
+
+DEFAULT_CHUNK_SIZE = 100
+
+PERCENTILES = (50, 90, 99)
+
+_simulator = None
+
+
+class GameSimulator:
+    def __init__(
+        self,
+        wordlist_name: str,
+        index: WordIndex,
+        strategy: str = "entropy",
+        hard_mode: bool = False,
+        max_turns: int = DEFAULT_MAX_TURNS,
+    ) -> None:
+        if strategy not in STRATEGIES:
+            raise ValueError(f'Unknown strategy "{strategy}"')
+
+        self.wordlist_name = wordlist_name
+        self.index = index
+        self.strategy = strategy
+        self.hard_mode = hard_mode
+        self.max_turns = max_turns
+        self.opening = self.choose(SolverSession(wordlist_name, index))
+
+    def choose(self, session: SolverSession) -> str:
+        if self.strategy == "rank" or len(session) <= 2:
+            survivors = session.survivors
+            return self.index[(survivors & -survivors).bit_length() - 1]
+        return session.suggest(self.hard_mode)
+
+    def play(self, answer: str) -> tuple:
+        session = SolverSession(self.wordlist_name, self.index)
+        solved = 3**self.index.word_length - 1
+        latencies = []
+
+        for turn in range(1, self.max_turns + 1):
+            start_time = time.perf_counter()
+            guess = self.opening if turn == 1 else self.choose(session)
+            pattern = feedback_pattern(guess, answer)
+            session.apply(guess, pattern)
+            latencies.append(time.perf_counter() - start_time)
+            if pattern == solved:
+                return turn, True, latencies
+
+        return self.max_turns, False, latencies
+
+    def play_all(self, answer_indices: list) -> list:
+        return [self.play(self.index[idx]) for idx in answer_indices]
+
+    def simulate(self, answer_indices: list = None, workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+        if answer_indices is None:
+            answer_indices = list(range(len(self.index)))
+
+        start_time = time.perf_counter()
+        chunks = [answer_indices[start:end] for start, end in _chunk_bounds(len(answer_indices), chunk_size)]
+        if workers > 1:
+            with ProcessPoolExecutor(workers, initializer=init_simulation, initargs=(self,)) as executor:
+                results = [result for chunk in executor.map(play_chunk, chunks) for result in chunk]
+        else:
+            results = [result for chunk in chunks for result in self.play_all(chunk)]
+        elapsed_time = time.perf_counter() - start_time
+
+        return self.summarize(results, elapsed_time, workers)
+
+    def summarize(self, results: list, elapsed_time: float, workers: int = 1) -> dict:
+        turns = [turn for turn, solved, _ in results if solved]
+        latencies = np.array([latency for _, _, game_latencies in results for latency in game_latencies])
+        distribution = Counter(turns)
+
+        return {
+            "wordlist": self.wordlist_name,
+            "length": self.index.word_length,
+            "words": len(self.index),
+            "strategy": self.strategy,
+            "hard_mode": self.hard_mode,
+            "opening": self.opening,
+            "workers": workers,
+            "games": len(results),
+            "solved": len(turns),
+            "average_guesses": sum(turns) / len(turns) if turns else None,
+            "max_guesses": max(turns, default=None),
+            "guess_distribution": {str(turn): distribution[turn] for turn in sorted(distribution)},
+            "turn_latency_ms": {
+                **{f"p{p}": float(np.percentile(latencies, p)) * 1000 for p in PERCENTILES if latencies.size},
+                "max": float(latencies.max()) * 1000 if latencies.size else None,
+            },
+            "seconds": elapsed_time,
+            "games_per_second": len(results) / elapsed_time if elapsed_time else None,
+        }
+
+
+def init_simulation(simulator: GameSimulator):
+    global _simulator
+    _simulator = simulator
+
+
+def play_chunk(answer_indices: list) -> list:
+    return _simulator.play_all(answer_indices)
+
+
+def sample_answers(word_count: int, sample: int = None) -> list:
+    if sample is None or sample >= word_count:
+        return list(range(word_count))
+    return np.linspace(0, word_count - 1, sample).round().astype(int).tolist()
+
+
+def _chunk_bounds(count: int, chunk_size: int):
+    for start in range(0, count, chunk_size):
+        yield start, min(start + chunk_size, count)
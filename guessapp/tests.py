@@ -1,9 +1,51 @@
-from django.db import IntegrityError
+import asyncio
+import bz2
+import gc
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import io
+import json
+import lzma
+import threading
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, connections
+from django.http import HttpResponse
 import pytest
+from guessapp.aio import Coalescer, get_index
+from guessapp.alphabet import ENGLISH, GERMAN, GERMAN_FOLDED, UMLAUTS, Alphabet, get_alphabet
+from guessapp.apps import preload_indexes
+from guessapp.benchmarks import compare_benchmarks, run_benchmarks, synthetic_words
+from guessapp.cache import WordIndexCache, index_cache
+from guessapp.feedback import GREEN, GREY, YELLOW, encode_words, feedback_matrix, feedback_pattern
 from guessapp.guesser import Guesser
-
-from guessapp.importer import WordlistImporter
-from guessapp.models import Word, Wordlist
+from guessapp.histogram import Histogram
+
+from guessapp.importer import (
+    StreamingWordlistImporter,
+    WordlistImporter,
+    WordlistRater,
+    bump_version,
+    load_histogram,
+    open_wordlist,
+    rerate_wordlist,
+)
+from guessapp.index import WordIndex
+from guessapp.memo import DjangoCacheMemoStore, GuessMemo, LocalMemoStore, guess_memo
+from guessapp.metrics import NULL_TIMER, Metrics, metrics
+from guessapp.middleware import query_metrics_middleware
+from guessapp.models import Word, Wordlist, WordlistHistogram
+from guessapp.openings import OpeningBook, opening_books, write_opening_book
+from guessapp.patterns import PatternMatrix, PatternMatrixStore, pattern_matrix_path, write_pattern_matrix
+from guessapp.query import GuessQuery
+from guessapp.recommender import Recommender
+from guessapp.scoring import rate_words
+from guessapp.search import INDEX, SCAN, PatternQuery
+from guessapp.session import SCAN_THRESHOLD, SolverSession, feedback_mask
+from guessapp.simulation import GameSimulator, sample_answers
+from guessapp.views import needs_scan, parse_guess_query
+from guessapp.wordfile import WordlistFile, wordlist_files, wordlist_path, write_wordlist_file
 
 
 @pytest.mark.django_db
@@ -16,6 +58,18 @@ def test_filter_word_length():
     assert 2 == Word.objects.filter(word__length=4).count()
 
 
+@pytest.mark.django_db
+def test_stored_word_length():
+    german = Wordlist.objects.create(name="German")
+    german.words.create(word="abc", rating=6)
+    WordlistImporter(["abcd", "efgh"]).persist("Imported")
+    StreamingWordlistImporter(lambda: io.StringIO("abcde\nfghij")).persist("Streamed")
+
+    assert 1 == Word.objects.filter(length=3).count()
+    assert 2 == Word.objects.filter(length=4).count()
+    assert 2 == Word.objects.filter(length=5).count()
+
+
 @pytest.mark.django_db
 def test_importer():
     lines = ["abc", "def", "abcdefghi", "ghi", "feg", "leg", "jklmnopqr", "abcjklstu"]
@@ -35,6 +89,283 @@ def test_importer():
         importer.persist("Test words")
 
 
+@pytest.mark.django_db
+def test_importer_persist_in_batches():
+    lines = [f"{a}{b}{c}" for a in "abcdefg" for b in "hijklmn" for c in "opqrstu"]
+    persisted_count = WordlistImporter(lines).persist("Test words", batch_size=100)
+
+    assert persisted_count == len(lines)
+    assert sorted(Word.objects.values_list("word", flat=True)) == sorted(lines)
+
+
+@pytest.mark.django_db
+def test_streaming_importer():
+    lines = ["abc", "def", "abcdefghi", "ghi", "Feg", "leg", "jklmnopqr", "abcjklstu", "abc", "NOT"]
+    importer = StreamingWordlistImporter(lambda: io.StringIO("\n".join(lines)))
+    persisted_count = importer.persist("Test words", batch_size=3)
+
+    assert persisted_count == 8
+    assert Word.objects.count() == 8
+    wordlist = Wordlist.objects.get(name="Test words")
+    assert load_histogram(wordlist, 3) == Histogram.from_words(["abc", "def", "ghi", "feg", "leg"])
+
+    word = Word.objects.filter(word__length=3).order_by("-rating").first().word
+    assert word == "feg"
+
+    with pytest.raises(IntegrityError):
+        importer.persist("Test words")
+
+
+@pytest.mark.django_db
+def test_streaming_importer_with_workers():
+    lines = [f"{a}{b}{c}" for a in "abcdefg" for b in "hijklmn" for c in "opqrstuvwxyz"] + ["abcdefghi", "abc"]
+    importer = StreamingWordlistImporter(lambda: io.StringIO("\n".join(lines)), workers=2, chunk_size=50)
+    importer.persist("Parallel words")
+    WordlistImporter(lines).persist("Sequential words")
+
+    parallel = Word.objects.filter(wordlist__name="Parallel words").values_list("word", "rating")
+    sequential = Word.objects.filter(wordlist__name="Sequential words").values_list("word", "rating")
+    assert sorted(parallel) == sorted(sequential)
+
+
+@pytest.mark.django_db
+def test_streaming_importer_with_alphabet():
+    lines = ["Straße", "Größe", "Haus", "Café", "Ökonom", "groesse"]
+    importer = StreamingWordlistImporter(lambda: io.StringIO("\n".join(lines)), workers=2, alphabet=GERMAN_FOLDED)
+    assert importer.persist("Test words") == 4
+
+    assert Wordlist.objects.get(name="Test words").alphabet == "de-folded"
+    assert sorted(Word.objects.values_list("word", flat=True)) == ["groesse", "haus", "oekonom", "strasse"]
+
+    index = WordIndexCache().get("Test words", 7)
+    assert index.alphabet is GERMAN_FOLDED
+    assert index.codes.tolist() == [GERMAN_FOLDED.encode(word) for word in index]
+
+
+def test_alphabet():
+    assert ENGLISH.normalize("Café") == "cafe"
+    assert GERMAN.normalize("Mu\u0308de") == "müde"
+    assert GERMAN_FOLDED.normalize("Größe") == "groesse"
+    assert GERMAN.is_valid("größe")
+    assert not ENGLISH.is_valid("größe")
+
+    assert len(GERMAN) == 30
+    assert GERMAN.encode("aß") == [0, 29]
+    assert GERMAN.decode([0, 29]) == "aß"
+    assert GERMAN.encode_text("abäßz", 5).tolist() == [[0, 1, 26, 29, 25]]
+    assert Alphabet.from_text("hello").letters == "ehlo"
+
+    with pytest.raises(ValueError):
+        ENGLISH.code("ä")
+    with pytest.raises(ValueError):
+        ENGLISH.encode_text("abcä€", 5)
+    with pytest.raises(ValueError):
+        Alphabet("test", "aba")
+    with pytest.raises(ValueError):
+        get_alphabet("unknown")
+
+
+def test_feedback_matrix_with_alphabet():
+    index = WordIndex(["abcde", "äbcdß", "edcba", "aaaaa"], 5, alphabet=GERMAN)
+    codepoints = encode_words(index.text, 5)
+    expected = feedback_matrix(codepoints, codepoints)
+    assert (feedback_matrix(index.codes, index.codes, alphabet_size=len(GERMAN)) == expected).all()
+
+
+@pytest.mark.django_db
+def test_importer_update(tmp_path, django_capture_on_commit_callbacks):
+    WordlistImporter(["abc", "def", "feg", "cab", "abcde", "fghij", "abcdefghi"]).persist("Test words")
+    ratings = dict(Word.objects.values_list("word", "rating"))
+    index_cache.get("Test words", 3)
+
+    path = tmp_path / "words.txt"
+    path.write_text("\n".join(["abc", "def", "feg", "bac", "abcde", "fghij", "abcdf", "abcd"]))
+    output = io.StringIO()
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("import_wordlist", "Test words", str(path), "--update", stdout=output)
+    assert "added 3 and removed 2 words" in output.getvalue()
+
+    updated = dict(Word.objects.values_list("word", "rating"))
+    assert sorted(updated) == ["abc", "abcd", "abcde", "abcdf", "bac", "def", "feg", "fghij"]
+    assert {word: updated[word] for word in ["abc", "def", "feg"]} == {
+        word: ratings[word] for word in ["abc", "def", "feg"]
+    }
+    assert updated["bac"] == ratings["cab"]
+    expected = rate_words(["abcde", "fghij", "abcdf"], 5).tolist()
+    assert [updated[word] for word in ["abcde", "fghij", "abcdf"]] == expected
+    assert ("Test words", 3) not in index_cache
+    wordlist = Wordlist.objects.get(name="Test words")
+    assert load_histogram(wordlist, 3) == Histogram.from_words(["abc", "def", "feg", "bac"])
+    assert load_histogram(wordlist, 9) == Histogram()
+
+    assert WordlistImporter(["abc", "xyz", "abd", "abc"]).update("Test words") == (2, 7)
+    assert load_histogram(wordlist, 3) == Histogram.from_words(["abc", "xyz", "abd"])
+    with pytest.raises(Wordlist.DoesNotExist):
+        WordlistImporter(["abc"]).update("Missing words")
+
+
+def test_histogram():
+    histogram = Histogram.from_words(["abc", "abd", "cab"])
+    assert histogram.to_json() == {"a": [2, 1, 0], "b": [0, 2, 1], "c": [1, 0, 1], "d": [0, 0, 1]}
+    assert histogram.character_counts == {"a": 3, "b": 3, "c": 2, "d": 1}
+    assert Histogram.from_json(json.loads(json.dumps(histogram.to_json()))) == histogram
+
+    histogram.subtract(["abd"])
+    histogram.merge(Histogram.from_words(["bcd"]))
+    assert histogram == Histogram.from_words(["abc", "cab", "bcd"])
+
+    with pytest.raises(ValueError):
+        histogram.update(["abcd"])
+
+
+@pytest.mark.django_db
+def test_importer_persists_histograms():
+    lines = ["abc", "def", "abcdefghi", "ghi", "Feg", "leg", "abc"]
+    StreamingWordlistImporter(lambda: io.StringIO("\n".join(lines)), workers=2).persist("Test words")
+    wordlist = Wordlist.objects.get(name="Test words")
+
+    assert WordlistHistogram.objects.filter(wordlist=wordlist).count() == 2
+    assert load_histogram(wordlist, 3) == Histogram.from_words(["abc", "def", "ghi", "feg", "leg"])
+    assert load_histogram(wordlist, 4) is None
+
+    rerate_wordlist(wordlist)
+    assert load_histogram(wordlist, 3) == Histogram.from_words(["abc", "def", "ghi", "feg", "leg"])
+
+    WordlistImporter(["abc", "abc", "abc", "xyz"]).persist("Duplicate words")
+    wordlist = Wordlist.objects.get(name="Duplicate words")
+    assert load_histogram(wordlist, 3) == Histogram.from_words(["abc", "xyz"])
+
+
+@pytest.mark.parametrize(
+    "model, ratings",
+    [("frequency", [6, 8, 6]), ("positional", [4, 4, 3]), ("bigram", [3, 4, 3])],
+)
+def test_rate_words(model, ratings):
+    assert rate_words(["aab", "abc", "bcd"], 3, model).tolist() == ratings
+
+
+def test_rate_words_matches_rater():
+    words = ["abc", "def", "feg", "leg", "ghi", "aäb", "zzz"]
+    rater = WordlistRater()
+    for word in words:
+        rater.add(word)
+
+    assert rate_words(words, 3).tolist() == [rater.rate(word) for word in words]
+
+    with pytest.raises(ValueError):
+        rate_words(words, 3, "unknown")
+
+
+@pytest.mark.django_db
+def test_rerate_wordlist(django_capture_on_commit_callbacks):
+    WordlistImporter(["aab", "abc", "bcd", "abcdefghi"]).persist("Test words")
+    index_cache.get("Test words", 3)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert rerate_wordlist(Wordlist.objects.get(name="Test words"), "bigram", batch_size=2) == 4
+
+    assert dict(Word.objects.filter(length=3).values_list("word", "rating")) == {"aab": 3, "abc": 4, "bcd": 3}
+    assert Word.objects.get(word="abcdefghi").rating == 8
+    assert ("Test words", 3) not in index_cache
+    assert Wordlist.objects.get(name="Test words").scoring == "bigram"
+
+    WordlistImporter(["aab", "abc", "bcd", "bca", "abcdefghi"]).update("Test words")
+    words = ["aab", "abc", "bcd", "bca"]
+    expected = dict(zip(words, rate_words(words, 3, "bigram").tolist()))
+    assert dict(Word.objects.filter(length=3).values_list("word", "rating")) == expected
+
+
+@pytest.mark.parametrize("open_compressed", [open, gzip.open, bz2.open, lzma.open])
+def test_open_wordlist(tmp_path, open_compressed):
+    filename = tmp_path / "words"
+    with open_compressed(filename, "wt", encoding="utf-8") as file:
+        file.write("äbc\ndef\n")
+
+    with open_wordlist(filename) as lines:
+        assert [line.strip() for line in lines] == ["äbc", "def"]
+
+
+@pytest.mark.django_db
+def test_index_cache(django_capture_on_commit_callbacks):
+    cache = WordIndexCache()
+    lines = ["abc", "def", "abcdefghi", "ghi", "feg", "leg", "jklmnopqr", "abcjklstu"]
+    with django_capture_on_commit_callbacks(execute=True):
+        WordlistImporter(lines).persist("Test words")
+
+    index = cache.get("Test words", 3)
+    assert index[0] == "feg"
+    assert sorted(index) == ["abc", "def", "feg", "ghi", "leg"]
+    assert list(index.ratings) == sorted(index.ratings, reverse=True)
+    assert cache.get("Test words", 3) is index
+    assert ("Test words", 3) in cache
+
+    cache.invalidate("Test words")
+    assert ("Test words", 3) not in cache
+    assert cache.size_bytes == 0
+
+    with pytest.raises(Wordlist.DoesNotExist):
+        cache.get("Missing words", 3)
+
+
+@pytest.mark.django_db
+def test_index_cache_warm():
+    WordlistImporter(["abc", "def", "abcdefghi"]).persist("Test words")
+    WordlistImporter(["abcd"]).persist("Other words")
+    cache = WordIndexCache()
+
+    assert cache.warm(["Test words"]) == [("Test words", 3), ("Test words", 9)]
+    assert ("Test words", 9) in cache
+    assert ("Other words", 4) not in cache
+    assert cache.warm() == [("Other words", 4), ("Test words", 3), ("Test words", 9)]
+
+
+@pytest.mark.django_db
+def test_index_cache_reloads_changed_wordlists(settings):
+    WordlistImporter(["abc", "def"]).persist("Test words")
+    cache = WordIndexCache()
+    assert sorted(cache.get("Test words", 3)) == ["abc", "def"]
+    assert cache.peek("Test words", 3) is cache.get("Test words", 3)
+
+    wordlist = Wordlist.objects.get(name="Test words")
+    wordlist.words.filter(word="def").delete()
+    bump_version(wordlist)
+    assert sorted(cache.get("Test words", 3)) == ["abc", "def"]
+
+    settings.GUESSAPP_INDEX_CHECK_SECONDS = 0
+    assert cache.peek("Test words", 3) is None
+    assert list(cache.get("Test words", 3)) == ["abc"]
+
+    wordlist.delete()
+    with pytest.raises(Wordlist.DoesNotExist):
+        cache.get("Test words", 3)
+
+
+@pytest.mark.django_db
+def test_preload_indexes(monkeypatch):
+    WordlistImporter(["abc", "def", "abcdefghi"]).persist("Test words")
+    index_cache.invalidate()
+    closed = []
+    monkeypatch.setattr(connections, "close_all", lambda: closed.append(True))
+    try:
+        assert preload_indexes() == [("Test words", 3), ("Test words", 9)]
+        assert closed == [True]
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+        index_cache.invalidate()
+
+
+@pytest.mark.django_db
+def test_index_cache_evicts_least_recently_used():
+    WordlistImporter(["abc", "def", "abcd", "efgh", "abcde"]).persist("Test words")
+    cache = WordIndexCache(max_bytes=1)
+
+    cache.get("Test words", 3)
+    cache.get("Test words", 4)
+    assert ("Test words", 3) not in cache
+    assert ("Test words", 4) in cache
+
+
 def test_guesser_validate_wordlist_with_empty_wordlist():
     wordlist = []
     word_length = 0
@@ -376,3 +707,729 @@ def test_guesser_validate_characters_excluded_at():
     characters_excluded_at = {"a": [0]}
 
     Guesser(wordlist, word_length, characters_excluded_at=characters_excluded_at).validate()
+
+
+def test_guesser_guess_without_constraints():
+    wordlist = ["abcde", "cdefg", "efghi"]
+    word_length = 5
+
+    assert Guesser(wordlist, word_length).guess() == wordlist
+
+
+def test_guesser_guess_excluded_characters():
+    wordlist = ["abcde", "cdefg", "efghi", "ähnli"]
+    word_length = 5
+
+    assert Guesser(wordlist, word_length).guess() == wordlist
+    assert Guesser(wordlist, word_length, excluded_characters=UMLAUTS).guess() == ["abcde", "cdefg", "efghi"]
+    assert Guesser(wordlist, word_length, excluded_characters=["a", "i"]).guess() == ["cdefg"]
+
+
+def test_guesser_guess_safe_characters():
+    wordlist = ["abcde", "cdefg", "efghi", "aedcf"]
+    word_length = 5
+    safe_characters = {"a": 0, "c": 2}
+
+    assert Guesser(wordlist, word_length, safe_characters=safe_characters).guess() == ["abcde"]
+
+
+def test_guesser_guess_characters_anywhere():
+    wordlist = ["abcde", "eeefg", "efghe", "fghij"]
+    word_length = 5
+
+    assert Guesser(wordlist, word_length, characters_anywhere={"e": 1}).guess() == ["abcde", "eeefg", "efghe"]
+    assert Guesser(wordlist, word_length, characters_anywhere={"e": 2}).guess() == ["eeefg", "efghe"]
+    assert Guesser(wordlist, word_length, characters_anywhere={"e": 3}).guess() == ["eeefg"]
+
+
+def test_guesser_guess_characters_excluded_at():
+    wordlist = ["abcde", "eeefg", "efghe", "fghij"]
+    word_length = 5
+    characters_excluded_at = {"e": [0, 3]}
+
+    assert Guesser(wordlist, word_length, characters_excluded_at=characters_excluded_at).guess() == [
+        "abcde",
+        "fghij",
+    ]
+
+
+def test_guesser_guess_excluded_characters_limit_required_occurences():
+    wordlist = ["speed", "abide", "eerie", "crane"]
+    word_length = 5
+    excluded_characters = ["e"]
+    characters_anywhere = {"e": 1}
+
+    assert Guesser(
+        wordlist, word_length, excluded_characters=excluded_characters, characters_anywhere=characters_anywhere
+    ).guess() == ["abide", "crane"]
+
+
+@pytest.mark.parametrize(
+    "guess,answer,marks",
+    [
+        ("crane", "crane", [GREEN] * 5),
+        ("speed", "abide", [GREY, GREY, YELLOW, GREY, YELLOW]),
+        ("eerie", "speed", [YELLOW, YELLOW, GREY, GREY, GREY]),
+        ("abbey", "babes", [YELLOW, YELLOW, GREEN, GREEN, GREY]),
+    ],
+)
+def test_feedback_pattern(guess, answer, marks):
+    assert feedback_pattern(guess, answer) == sum(mark * 3**idx for idx, mark in enumerate(marks))
+
+
+def test_feedback_matrix():
+    words = ["crane", "speed", "abide", "eerie", "abbey", "babes", "geese", "ëëëëa"]
+    codes = encode_words("".join(words), 5)
+    matrix = feedback_matrix(codes, codes, chunk_bytes=8)
+
+    assert matrix.dtype == "uint8"
+    for i, guess in enumerate(words):
+        for j, answer in enumerate(words):
+            assert matrix[i, j] == feedback_pattern(guess, answer)
+
+
+def test_recommender():
+    words = ["abcd", "abce", "abcf", "abcg", "efgx"]
+    index = WordIndex(words, 4)
+    recommender = Recommender(index, chunk_bytes=1)
+
+    best_word, best_entropy = recommender.recommend(index.position_mask(0, "a"))[0]
+    assert best_word == "efgx"
+    assert best_entropy == pytest.approx(2.0)
+
+    best_word, best_entropy = recommender.recommend(index.position_mask(3, "d") | index.position_mask(3, "e"))[0]
+    assert best_word == "abcd"
+    assert best_entropy == pytest.approx(1.0)
+
+    best_word, _ = recommender.recommend(index.position_mask(0, "a"), hard_mode=True)[0]
+    assert best_word == "abcd"
+
+
+def test_guesser_recommend():
+    wordlist = ["abcd", "abce", "abcf", "abcg", "efgx"]
+    word_length = 4
+    safe_characters = {"a": 0}
+
+    recommendations = Guesser(wordlist, word_length, safe_characters=safe_characters).recommend(limit=2)
+    assert [word for word, _ in recommendations] == ["efgx", "abcd"]
+
+
+def test_word_index_find():
+    index = WordIndex(["abcd", "abce", "efgx"], 4)
+
+    assert index.find("abce") == 1
+    assert index.find("efgx") == 2
+    assert index.find("abcx") == -1
+    assert index.find("abc") == -1
+
+
+def test_word_index_indices():
+    words = [f"{idx:05d}" for idx in range(5000)]
+    index = WordIndex(words, 5)
+    selected = list(range(3, 5000, 7))
+    mask = index.mask(selected)
+
+    assert list(index.indices(mask)) == selected
+    assert list(index.indices(mask, 100)) == selected[100:]
+    assert list(index.indices(mask, len(selected))) == []
+    assert list(index.indices(0)) == []
+
+
+def test_guesser_ranked():
+    wordlist = ["abcde", "cdefg", "efghi", "ghijk"]
+    word_length = 5
+    guesser = Guesser(wordlist, word_length, excluded_characters=["a"])
+
+    assert guesser.guess(limit=2) == ["cdefg", "efghi"]
+    assert guesser.guess(limit=2, offset=2) == ["ghijk"]
+    assert [word for word, _ in guesser.ranked(offset=1)] == ["efghi", "ghijk"]
+
+
+def test_pattern_matrix(tmp_path):
+    words = ["abcd", "abce", "abcf", "abcg", "efgx"]
+    index = WordIndex(words, 4)
+    path = tmp_path / "words-4.wgpm"
+    write_pattern_matrix(path, index, chunk_bytes=8)
+    pattern_matrix = PatternMatrix.load(path, index)
+
+    for i, guess in enumerate(words):
+        assert list(pattern_matrix.row(i)) == [feedback_pattern(guess, answer) for answer in words]
+
+    guess_idx = index.find("efgx")
+    assert index.words(pattern_matrix.matching(guess_idx, feedback_pattern("efgx", "abce"))) == ["abce"]
+
+    candidates = index.position_mask(0, "a")
+    recommender = Recommender(index, pattern_matrix=pattern_matrix)
+    assert recommender.recommend(candidates) == Recommender(index).recommend(candidates)
+
+    with pytest.raises(ValueError):
+        PatternMatrix.load(path, WordIndex(words[:4], 4))
+
+
+def test_pattern_matrix_store(tmp_path, settings):
+    settings.GUESSAPP_DATA_DIR = tmp_path
+    index = WordIndex(["abcd", "abce"], 4)
+    store = PatternMatrixStore()
+    assert store.get(index) is None
+
+    write_pattern_matrix(pattern_matrix_path(index), index)
+    assert store.get(index) is store.get(index)
+    assert store.get(index) is not None
+
+
+def test_wordlist_file(tmp_path):
+    index = WordIndex(["abcd", "äbcd", "dcba"], 4, [7, 5, 3])
+    path = tmp_path / "test-words-4.wgwl"
+    assert write_wordlist_file(path, index) == path.stat().st_size
+
+    wordlist_file = WordlistFile.load(path)
+    assert len(wordlist_file) == 3
+    assert wordlist_file.codes.itemsize == 1
+    assert wordlist_file.words == ["abcd", "äbcd", "dcba"]
+
+    loaded = wordlist_file.index()
+    assert list(loaded) == list(index)
+    assert list(loaded.ratings) == [7, 5, 3]
+    assert loaded.fingerprint == index.fingerprint
+    assert loaded.codes.tolist() == index.codes.tolist()
+    for char in "abcdä":
+        assert [loaded.position_mask(idx, char) for idx in range(4)] == [
+            index.position_mask(idx, char) for idx in range(4)
+        ]
+        assert [loaded.count_mask(char, count) for count in range(6)] == [
+            index.count_mask(char, count) for count in range(6)
+        ]
+    assert loaded.filter(["x"], {"b": 1}, {"a": 1}, {"d": [0]}) == index.filter(["x"], {"b": 1}, {"a": 1}, {"d": [0]})
+
+    path.write_bytes(b"WGPM" + bytes(60))
+    with pytest.raises(ValueError):
+        WordlistFile.load(path)
+
+
+@pytest.mark.django_db
+def test_export_wordlist(tmp_path, settings, django_capture_on_commit_callbacks):
+    settings.GUESSAPP_DATA_DIR = tmp_path
+    with django_capture_on_commit_callbacks(execute=True):
+        WordlistImporter(["abc", "def", "feg", "abcdefghi"]).persist("Test words")
+    call_command("export_wordlist", "Test words", stdout=io.StringIO())
+    assert wordlist_files("Test words") == [wordlist_path("Test words", 3), wordlist_path("Test words", 9)]
+    assert wordlist_files("test words") == []
+    assert wordlist_path("Слова", 5) != wordlist_path("Слово", 5)
+
+    expected = WordIndexCache().load_database("Test words", 3)
+    Word.objects.all().delete()
+    index = WordIndexCache().get("Test words", 3)
+    assert list(index) == list(expected)
+    assert list(index.ratings) == list(expected.ratings)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        rerate_wordlist(Wordlist.objects.get(name="Test words"))
+    assert wordlist_files("Test words") == []
+
+
+@pytest.mark.django_db
+def test_stale_wordlist_file_is_skipped(tmp_path, settings):
+    settings.GUESSAPP_DATA_DIR = tmp_path
+    settings.GUESSAPP_INDEX_CHECK_SECONDS = 0
+    WordlistImporter(["abc", "def"]).persist("Test words")
+    call_command("export_wordlist", "Test words", stdout=io.StringIO())
+    cache = WordIndexCache()
+    assert sorted(cache.get("Test words", 3)) == ["abc", "def"]
+
+    WordlistImporter(["abc", "xyz"]).update("Test words")
+    assert wordlist_files("Test words") == [wordlist_path("Test words", 3)]
+    assert sorted(cache.get("Test words", 3)) == ["abc", "xyz"]
+
+
+SEARCH_WORDS = ["crane", "crate", "trace", "react", "cater", "eerie", "error"]
+
+
+@pytest.mark.parametrize(
+    "query, words, path",
+    [
+        ({"pattern": "_ra_e"}, ["crane", "crate", "trace"], INDEX),
+        ({"pattern": "c[^r]___"}, ["cater"], INDEX),
+        ({"pattern": "[ce]*[re]"}, ["crane", "crate", "cater", "eerie", "error"], INDEX),
+        ({"contains": "rr"}, ["error"], INDEX),
+        ({"counts": {"e": 3}}, ["eerie"], INDEX),
+        ({"counts": {"r": 1}, "pattern": "*t*"}, ["crate", "trace", "react", "cater"], INDEX),
+        ({"pattern": "crane*s"}, [], INDEX),
+        ({"pattern": "c*t*"}, ["crate", "cater"], INDEX),
+        ({"pattern": "*ra*"}, ["crane", "crate", "trace"], INDEX),
+        ({"pattern": "*r?r*"}, ["error"], INDEX),
+        ({"pattern": "cr*[^a]*e"}, ["crane", "crate"], INDEX),
+        ({"pattern": "*e*r*"}, ["cater", "eerie", "error"], SCAN),
+        ({"contains": "t", "regex": "[^e]*e[^e]*"}, ["crate", "trace", "react", "cater"], SCAN),
+    ],
+)
+def test_pattern_query(query, words, path):
+    index = WordIndex(SEARCH_WORDS, 5)
+    mask, used_path = PatternQuery.compile(**query).filter(index)
+    assert index.words(mask) == words
+    assert used_path == path
+
+
+@pytest.mark.parametrize(
+    "query",
+    [{"pattern": "[ab"}, {"pattern": "a[]"}, {"regex": "("}, {"counts": {"a": -1}}, {"counts": {"ab": 1}}],
+)
+def test_pattern_query_errors(query):
+    with pytest.raises(ValueError):
+        PatternQuery.compile(**query)
+
+
+def test_guesser_search():
+    guesser = Guesser(SEARCH_WORDS + ["träce"], 5, characters_excluded_at={"t": [0]})
+    assert guesser.search(pattern="__a_e") == (guesser.index.mask([0, 1]), INDEX)
+
+    with pytest.raises(ValueError):
+        guesser.search(pattern="____")
+
+
+@pytest.fixture
+def guess_api(client, django_capture_on_commit_callbacks):
+    index_cache.invalidate()
+    with django_capture_on_commit_callbacks(execute=True):
+        WordlistImporter(["abcde", "cdefg", "efghi", "aabbc", "abc"]).persist("Test words")
+
+    def post(**data):
+        return client.post("/api/guess", json.dumps(data), content_type="application/json")
+
+    return post
+
+
+@pytest.mark.django_db(transaction=True)
+def test_api_guess(guess_api):
+    response = guess_api(wordlist="Test words", length=5, characters_anywhere={"c": 1})
+    assert response.status_code == 200
+    assert response["Server-Timing"].startswith("index;dur=")
+    assert "validate;dur=" in response["Server-Timing"]
+    assert "filter;dur=" in response["Server-Timing"]
+    assert "serialize;dur=" in response["Server-Timing"]
+
+    data = response.json()
+    assert data["count"] == 3
+    assert [result["word"] for result in data["results"]] == ["abcde", "cdefg", "aabbc"]
+    assert [result["rating"] for result in data["results"]] == sorted(
+        [result["rating"] for result in data["results"]], reverse=True
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_api_guess_pagination(guess_api):
+    response = guess_api(wordlist="Test words", length=5, page=2, page_size=2)
+    data = response.json()
+    assert data["count"] == 4
+    assert data["page"] == 2
+    assert sorted(result["word"] for result in data["results"]) == ["aabbc", "efghi"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_api_guess_errors(guess_api, client):
+    assert guess_api(wordlist="Missing words", length=5).status_code == 404
+    assert guess_api(length=5).status_code == 400
+    assert guess_api(wordlist="Test words", length=0).status_code == 400
+    assert guess_api(wordlist="Test words", length=5, page_size=100000).status_code == 400
+
+    response = guess_api(wordlist="Test words", length=5, safe_characters={"a": 5})
+    assert response.status_code == 400
+    assert response.json() == {"error": 'Index of safe character "a" out of bounds'}
+
+    assert client.post("/api/guess", "{", content_type="application/json").status_code == 400
+    assert client.get("/api/guess").status_code == 405
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize(
+    "constraints",
+    [
+        {"safe_characters": ["a"]},
+        {"characters_anywhere": "a"},
+        {"characters_excluded_at": [["a", 0]]},
+        {"excluded_characters": "a"},
+        {"excluded_characters": [["a"]]},
+    ],
+)
+def test_api_guess_constraint_types(guess_api, constraints):
+    assert guess_api(wordlist="Test words", length=5, **constraints).status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+def test_api_guess_with_database_memo(guess_api, settings, monkeypatch):
+    settings.CACHES = {
+        **settings.CACHES,
+        "memo": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "guessapp_memo"},
+    }
+    call_command("createcachetable", "--database", "default")
+    monkeypatch.setattr(guess_memo, "store", DjangoCacheMemoStore("memo", ttl=60))
+
+    for _ in range(2):
+        response = guess_api(wordlist="Test words", length=5, characters_anywhere={"c": 1})
+        assert response.status_code == 200
+        assert response.json()["count"] == 3
+    assert guess_memo.hits >= 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_api_guess_search(guess_api):
+    response = guess_api(wordlist="Test words", length=5, pattern="[ac]*")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["path"] == "index"
+    assert sorted(result["word"] for result in data["results"]) == ["aabbc", "abcde", "cdefg"]
+
+    assert not needs_scan(parse_guess_query(json.dumps({"wordlist": "Test words", "length": 5, "pattern": "*a*"})))
+    assert needs_scan(parse_guess_query(json.dumps({"wordlist": "Test words", "length": 5, "pattern": "*a*c*"})))
+    data = guess_api(wordlist="Test words", length=5, pattern="*a*c*").json()
+    assert data["path"] == "scan"
+    assert sorted(result["word"] for result in data["results"]) == ["aabbc", "abcde"]
+
+    assert guess_api(wordlist="Test words", length=5, pattern="___").status_code == 400
+    assert guess_api(wordlist="Test words", length=5, regex="(a|aa)*c").status_code == 400
+
+
+@pytest.mark.parametrize("strategy", ["entropy", "rank"])
+def test_game_simulator(strategy):
+    words = ["crane", "crate", "trace", "react", "cater", "eerie", "error", "oiler", "tears", "rates"]
+    simulator = GameSimulator("Test words", WordIndex(words, 5), strategy)
+    turns, solved, latencies = simulator.play("oiler")
+    assert solved
+    assert len(latencies) == turns
+
+    results = simulator.simulate(workers=1, chunk_size=3)
+    assert results["games"] == results["solved"] == len(words)
+    assert 1 <= results["average_guesses"] <= results["max_guesses"] <= len(words)
+    assert sum(results["guess_distribution"].values()) == len(words)
+    assert results["turn_latency_ms"]["p50"] <= results["turn_latency_ms"]["max"]
+
+    parallel = simulator.simulate(workers=2, chunk_size=3)
+    assert parallel["guess_distribution"] == results["guess_distribution"]
+
+    assert GameSimulator("Test words", WordIndex(words, 5), "rank", max_turns=1).simulate()["solved"] == 1
+
+
+def test_opening_book(tmp_path, settings):
+    settings.GUESSAPP_DATA_DIR = tmp_path
+    words = ["crane", "crate", "trace", "react", "cater", "eerie", "error", "oiler", "tears", "rates"]
+    index = WordIndex(words, 5)
+    book = OpeningBook.build(index, responses=3)
+    recommender = Recommender(index)
+    assert (book.opening, book.entropy) == recommender.recommend(index.all, 1)[0]
+    assert len(book.responses) == 3
+
+    pattern, (guess, entropy) = next(iter(book.responses.items()))
+    survivors = index.mask(idx for idx, word in enumerate(words) if feedback_pattern(book.opening, word) == pattern)
+    assert (guess, entropy) == recommender.recommend(survivors, 1)[0]
+    assert book.lookup([(book.opening, pattern)]) == (guess, entropy)
+    assert book.lookup([(book.opening, pattern), (guess, 0)]) is None
+
+    loaded = OpeningBook.loads(book.dumps(index), index)
+    assert (loaded.opening, loaded.entropy, loaded.responses) == (book.opening, book.entropy, book.responses)
+    with pytest.raises(ValueError):
+        OpeningBook.loads(book.dumps(index), WordIndex(words[1:], 5))
+
+    opening_books.invalidate()
+    try:
+        assert opening_books.get(index) is None
+        write_opening_book(OpeningBook("oiler", 9.0, {pattern: ("tears", 1.0)}), index)
+        assert Guesser(index, 5).recommend(limit=1) == [("oiler", 9.0)]
+        assert Guesser(index, 5).recommend(limit=2) != [("oiler", 9.0)]
+
+        session = SolverSession("Test words", index)
+        assert session.suggest() == "oiler"
+        session.turns.append(("oiler", pattern))
+        assert session.suggest() == "tears"
+    finally:
+        opening_books.invalidate()
+
+
+def test_sample_answers():
+    assert sample_answers(5) == [0, 1, 2, 3, 4]
+    assert sample_answers(5, 10) == [0, 1, 2, 3, 4]
+    assert sample_answers(101, 3) == [0, 50, 100]
+
+
+def test_coalescer_shares_in_flight_calls():
+    coalescer = Coalescer()
+    executor = ThreadPoolExecutor(max_workers=2)
+    released = threading.Event()
+    calls = []
+
+    def load(key):
+        released.wait()
+        calls.append(key)
+        return key.upper()
+
+    async def run():
+        futures = [coalescer.submit("a", executor, load, "a") for _ in range(3)]
+        assert futures[0] is futures[1] is futures[2]
+        released.set()
+        return await asyncio.gather(*(asyncio.wrap_future(future) for future in futures))
+
+    assert asyncio.run(run()) == ["A", "A", "A"]
+    assert calls == ["a"]
+    assert len(coalescer) == 0
+    assert asyncio.run(coalescer.run("b", executor, load, "b")) == "B"
+
+
+def test_coalescer_survives_cancelled_waiter():
+    coalescer = Coalescer()
+    executor = ThreadPoolExecutor(max_workers=1)
+    blocker = threading.Event()
+    executor.submit(blocker.wait)
+
+    async def run():
+        first = asyncio.ensure_future(coalescer.run("a", executor, str.upper, "a"))
+        second = asyncio.ensure_future(coalescer.run("a", executor, str.upper, "a"))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        blocker.set()
+        return await second
+
+    assert asyncio.run(run()) == "A"
+    assert len(coalescer) == 0
+
+
+def test_feedback_mask():
+    words = ["speed", "abide", "eerie", "crane", "geese", "spade", "deeds"]
+    index = WordIndex(words, 5)
+
+    for guess in words:
+        for answer in words:
+            pattern = feedback_pattern(guess, answer)
+            expected = [word for word in words if feedback_pattern(guess, word) == pattern]
+            assert index.words(feedback_mask(index, guess, pattern)) == expected
+
+
+def test_solver_session():
+    words = [f"{a}{b}{c}" for a in "abcdefghij" for b in "klmnopqrst" for c in "uvwxyzabcd"]
+    index = WordIndex(words, 3)
+    session = SolverSession("Test words", index)
+    assert len(session) == len(words) > SCAN_THRESHOLD
+
+    survivors = words
+    for guess in ["akx", "bly", "bkz"]:
+        pattern = feedback_pattern(guess, "bky")
+        survivors = [word for word in survivors if feedback_pattern(guess, word) == pattern]
+        assert session.apply(guess, pattern) == len(survivors)
+        assert session.words() == survivors
+    assert session.words() == ["bky"]
+
+    with pytest.raises(ValueError):
+        session.apply("ab", 0)
+
+
+def test_solver_session_serialization():
+    words = [f"{a}{b}{c}" for a in "abcdefghij" for b in "klmnopqrst" for c in "uvwxyzabcd"]
+    index = WordIndex(words, 3)
+    session = SolverSession("Test wörds", index)
+    full = SolverSession.loads(session.dumps(), index)
+    assert full.survivors == session.survivors
+
+    session.apply("akx", feedback_pattern("akx", "bky"))
+    session.apply("bly", feedback_pattern("bly", "bky"))
+    restored = SolverSession.loads(session.dumps(), index)
+    assert restored.wordlist_name == "Test wörds"
+    assert restored.survivors == session.survivors
+    assert restored.turns == session.turns
+    assert len(session.dumps()) < 100
+
+    replayed = SolverSession.loads(session.dumps(), WordIndex(list(reversed(words)), 3))
+    assert sorted(replayed.words()) == sorted(session.words())
+
+
+@pytest.mark.django_db
+def test_solver_session_cache(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        WordlistImporter(["abcde", "cdefg", "efghi", "aabbc"]).persist("Session words")
+    session = SolverSession.start("Session words", 5)
+    session.apply("abcde", feedback_pattern("abcde", "aabbc"))
+    session.save("player-1")
+
+    restored = SolverSession.load("player-1")
+    assert restored.words() == ["aabbc"]
+    assert SolverSession.load("player-2") is None
+
+
+def test_guess_query_compile():
+    query = GuessQuery.compile(
+        5,
+        excluded_characters=["x", "y"],
+        safe_characters={"b": 1, "a": 0},
+        characters_anywhere={"c": 1},
+        characters_excluded_at={"c": [3, 2, 3]},
+    )
+    equivalent = GuessQuery.compile(
+        5,
+        excluded_characters=["y", "x", "x"],
+        safe_characters={"a": 0, "b": 1},
+        characters_anywhere={"c": 1},
+        characters_excluded_at={"c": [2, 3]},
+    )
+
+    assert query == equivalent
+    assert hash(query) == hash(equivalent)
+    assert query != GuessQuery.compile(6, excluded_characters=["x", "y"])
+    assert query.filter(WordIndex(["abcde", "abdec", "abxce"], 5)) == 0b010
+
+    with pytest.raises(ValueError):
+        query.filter(WordIndex(["abcd"], 4))
+
+    with pytest.raises(IndexError) as e:
+        GuessQuery.compile(5, safe_characters={"a": 5})
+    assert e.value.args[0] == 'Index of safe character "a" out of bounds'
+
+
+def test_guesser_from_query():
+    query = GuessQuery.compile(5, ["a"], {"e": 2})
+    guesser = Guesser.from_query(["abcde", "cdefg", "efghi"], query)
+
+    assert guesser.query is query
+    assert guesser.guess() == ["cdefg"]
+
+
+def test_guesser_validate_word_length_with_index():
+    index = WordIndex(["abcde", "cdefg"], 5)
+
+    Guesser(index, 5).validate()
+    with pytest.raises(ValueError) as e:
+        Guesser(index, 4).validate()
+    assert e.value.args[0] == 'Unexpected length of word in wordlist: "abcde" with length of: 5'
+
+
+def test_local_memo_store():
+    store = LocalMemoStore(max_size=2, ttl=None)
+    store.set("a", 1)
+    store.set("b", 2)
+    assert store.get("a") == 1
+    store.set("c", 3)
+    assert store.get("b") is None
+    assert store.get("a") == 1
+    assert len(store) == 2
+
+    expiring = LocalMemoStore(max_size=2, ttl=-1)
+    expiring.set("a", 1)
+    assert expiring.get("a") is None
+    assert len(expiring) == 0
+
+    bounded = LocalMemoStore(max_size=10, ttl=None, max_bytes=20000)
+    bounded.set("a", 1 << 80000)
+    bounded.set("b", 1 << 80000)
+    assert bounded.get("a") is None
+    assert bounded.get("b") == 1 << 80000
+    assert len(bounded) == 1
+
+
+def test_django_cache_memo_store():
+    memo = GuessMemo(DjangoCacheMemoStore("default", ttl=60))
+    memo.clear()
+
+    assert memo.get_or_compute("key", lambda: 0b101) == 0b101
+    assert memo.get_or_compute("key", lambda: 0b111) == 0b101
+    assert (memo.hits, memo.misses) == (1, 1)
+    assert memo.hit_ratio == 0.5
+
+    cache.set("guessapp:session:player", b"state")
+    memo.clear()
+    assert memo.get_or_compute("key", lambda: 0b111) == 0b111
+    assert cache.get("guessapp:session:player") == b"state"
+
+    other = DjangoCacheMemoStore("default", ttl=60)
+    assert other.generation == memo.store.generation
+    cache.delete("guessapp:memo:generation")
+    assert other.generation == memo.store.generation != 0
+
+
+def test_guesser_guess_memoization():
+    guess_memo.clear()
+    wordlist = ["abcde", "cdefg", "efghi"]
+    word_length = 5
+
+    assert Guesser(wordlist, word_length, characters_anywhere={"c": 1}).guess() == ["abcde", "cdefg"]
+    assert Guesser(list(wordlist), word_length, characters_anywhere={"c": 1}).guess() == ["abcde", "cdefg"]
+    assert Guesser(wordlist, word_length, characters_anywhere={"c": 2}).guess() == []
+    assert Guesser(wordlist[:2], word_length, characters_anywhere={"c": 1}).guess() == ["abcde", "cdefg"]
+    assert (guess_memo.hits, guess_memo.misses) == (1, 3)
+
+
+def test_synthetic_words():
+    words = synthetic_words(100, seed=1)
+    assert len(words) == 100
+    assert words == synthetic_words(100, seed=1)
+    assert all(3 <= len(word) <= 9 for word in words)
+
+
+@pytest.mark.django_db
+def test_run_benchmarks():
+    results = run_benchmarks(sizes=[200], repeat=1)
+
+    assert set(results["results"]) == {
+        f"{name}[200]" for name in ("readlines", "rate", "validate", "guess", "persist", "query")
+    }
+    assert Word.objects.count() == 0
+    assert compare_benchmarks(results, results) == []
+
+
+def test_compare_benchmarks():
+    baseline = {"results": {"guess[10]": {"seconds": 1.0}, "rate[10]": {"seconds": 1.0}}}
+    current = {"results": {"guess[10]": {"seconds": 1.5}, "rate[10]": {"seconds": 1.05}, "new[10]": {"seconds": 1}}}
+
+    regressions = compare_benchmarks(baseline, current, threshold=0.1)
+    assert [regression["name"] for regression in regressions] == ["guess[10]"]
+    assert regressions[0]["change"] == pytest.approx(0.5)
+
+
+def test_metrics():
+    disabled = Metrics(enabled=False)
+    assert disabled.timer("guess_seconds", "filter") is NULL_TIMER
+    disabled.increment("index_cache_hits")
+    assert disabled.snapshot() == {}
+
+    enabled = Metrics(enabled=True)
+    with enabled.timer("guess_seconds", "filter"):
+        pass
+    enabled.observe("guess_seconds", 0.5, "filter")
+    enabled.increment("index_cache_hits", 2)
+
+    snapshot = enabled.snapshot()
+    assert snapshot["index_cache_hits"] == {"total": 2}
+    assert snapshot["guess_seconds"]["filter"]["count"] == 2
+    assert snapshot["guess_seconds"]["filter"]["sum"] >= 0.5
+
+    text = enabled.prometheus()
+    assert "# TYPE guessapp_index_cache_hits_total counter\nguessapp_index_cache_hits_total 2\n" in text
+    assert 'guessapp_guess_seconds_count{phase="filter"} 2\n' in text
+
+
+@pytest.mark.django_db(transaction=True)
+def test_metrics_endpoint(guess_api, client, monkeypatch):
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(metrics, "enabled", True)
+    metrics.reset()
+    guess_api(wordlist="Test words", length=5)
+    response = client.get("/metrics")
+    metrics.reset()
+
+    assert response.status_code == 200
+    assert 'guessapp_api_guess_seconds_count{phase="filter"} 1' in response.content.decode()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_query_metrics_middleware(guess_api, rf, monkeypatch):
+    monkeypatch.setattr(metrics, "enabled", True)
+    metrics.reset()
+    index_cache.invalidate()
+
+    async def get_response(request):
+        await get_index("Test words", 5)
+        return HttpResponse()
+
+    middleware = query_metrics_middleware(get_response)
+    asyncio.run(middleware(rf.get("/")))
+    snapshot = metrics.snapshot()
+    metrics.reset()
+
+    assert snapshot["db_queries_per_request"]["total"]["sum"] >= 1
+    assert snapshot["db_seconds_per_request"]["total"]["count"] == 1
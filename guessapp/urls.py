@@ -6,4 +6,6 @@ app_name = "guessapp"
 
 urlpatterns = [
     path("", views.index, name="index"),
+    path("api/guess", views.api_guess, name="api_guess"),
+    path("metrics", views.metrics_view, name="metrics"),
 ]
@@ -1,5 +1,172 @@
+from itertools import islice
+import json
+import time
+
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed, JsonResponse
 from django.shortcuts import render
 
+from guessapp.aio import get_index, run_blocking
+from guessapp.guesser import Guesser
+from guessapp.index import WordIndex
+from guessapp.memo import guess_memo
+from guessapp.metrics import metrics
+from guessapp.models import Wordlist
+from guessapp.query import GuessQuery
+from guessapp.search import PatternQuery
+
+
+DEFAULT_PAGE_SIZE = 100
+
+MAX_PAGE_SIZE = 10000
+
+CONSTRAINTS = {
+    "excluded_characters": list,
+    "safe_characters": dict,
+    "characters_anywhere": dict,
+    "characters_excluded_at": dict,
+}
+
+SEARCH = ("pattern", "contains", "counts")
+
+
+class BadRequest(ValueError):
+    pass
+
 
 def index(request):
     return render(request, "guessapp/index.html")
+
+
+async def api_guess(request):
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
+
+    start_time = time.perf_counter()
+    try:
+        query = parse_guess_query(request.body)
+        index = await get_index(query["wordlist"], query["length"])
+    except Wordlist.DoesNotExist as e:
+        return JsonResponse({"error": str(e)}, status=404)
+    except BadRequest as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    if guess_memo.blocking or needs_scan(query):
+        return await run_blocking(guess_response, query, index, time.perf_counter() - start_time)
+    return guess_response(query, index, time.perf_counter() - start_time)
+
+
+api_guess.csrf_exempt = True
+
+
+def guess_response(query: dict, index: WordIndex, load_time: float):
+    timings = {"index": load_time}
+
+    start_time = time.perf_counter()
+    try:
+        guess_query = GuessQuery.compile(query["length"], **query["constraints"])
+        guesser = Guesser.from_query(index, guess_query)
+        guesser.validate(
+            validate_excluded_characters=False,
+            validate_safe_characters=False,
+            validate_characters_anywhere=False,
+            validate_characters_excluded_at=False,
+        )
+    except (ValueError, TypeError, IndexError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    timings["validate"] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    path = None
+    if query["search"]:
+        try:
+            mask, path = guesser.search(**query["search"])
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+    else:
+        mask = guesser.filter()
+    count = mask.bit_count()
+    timings["filter"] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    offset = (query["page"] - 1) * query["page_size"]
+    page = [(index[idx], index.ratings[idx]) for idx in islice(index.indices(mask, offset), query["page_size"])]
+    content = encode_guess_response(count, query["page"], query["page_size"], page, path)
+    timings["serialize"] = time.perf_counter() - start_time
+
+    response = HttpResponse(content, content_type="application/json")
+    response["Server-Timing"] = server_timing(timings)
+    for phase, elapsed_time in timings.items():
+        metrics.observe("api_guess_seconds", elapsed_time, phase)
+    return response
+
+
+def metrics_view(request):
+    if not metrics.enabled:
+        raise Http404("Metrics are disabled")
+    return HttpResponse(metrics.prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def parse_guess_query(body: bytes) -> dict:
+    try:
+        data = json.loads(body or b"{}")
+    except ValueError:
+        raise BadRequest("Request body is not valid JSON")
+
+    if not isinstance(data, dict):
+        raise BadRequest("Request body has to be a JSON object")
+
+    if not isinstance(data.get("wordlist"), str):
+        raise BadRequest("Missing wordlist")
+
+    page = data.get("page", 1)
+    page_size = data.get("page_size", DEFAULT_PAGE_SIZE)
+    for name, value in (("length", data.get("length")), ("page", page), ("page_size", page_size)):
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            raise BadRequest(f"{name} has to be a positive integer")
+
+    if page_size > MAX_PAGE_SIZE:
+        raise BadRequest(f"page_size cannot exceed {MAX_PAGE_SIZE}")
+
+    validate_constraint_types(data)
+
+    if "regex" in data:
+        raise BadRequest("regex is not supported, use pattern instead")
+
+    return {
+        "wordlist": data["wordlist"],
+        "length": data["length"],
+        "page": page,
+        "page_size": page_size,
+        "constraints": {name: data[name] for name in CONSTRAINTS if name in data},
+        "search": {name: data[name] for name in SEARCH if name in data},
+    }
+
+
+def needs_scan(query: dict) -> bool:
+    if not query["search"]:
+        return False
+    try:
+        return bool(PatternQuery.compile(**query["search"]).scan_patterns)
+    except ValueError:
+        return False
+
+
+def validate_constraint_types(data: dict):
+    for name, expected_type in CONSTRAINTS.items():
+        if name in data and not isinstance(data[name], expected_type):
+            raise BadRequest(f"{name} has to be a JSON {'array' if expected_type is list else 'object'}")
+
+    if not all(isinstance(char, str) for char in data.get("excluded_characters", [])):
+        raise BadRequest("excluded_characters has to contain strings")
+
+
+def encode_guess_response(count: int, page: int, page_size: int, results: list, path: str = None) -> str:
+    data = {"count": count, "page": page, "page_size": page_size}
+    if path is not None:
+        data["path"] = path
+    data["results"] = [{"word": word, "rating": rating} for word, rating in results]
+    return json.dumps(data)
+
+
+def server_timing(timings: dict) -> str:
+    return ", ".join(f"{name};dur={elapsed * 1000:.3f}" for name, elapsed in timings.items())
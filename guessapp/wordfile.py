@@ -0,0 +1,154 @@
+from array import array
+import hashlib
+import os
+from pathlib import Path
+import re
+import struct
+
+from django.conf import settings
+from django.utils.text import slugify
+import numpy as np
+
+from guessapp.alphabet import Alphabet, code_dtype
+from guessapp.index import WordIndex
+
+
+MAGIC = b"WGWL"
+VERSION = 3
+HEADER = struct.Struct("<4sHHIQ32sQI")
+HEADER_SIZE = 64
+SUFFIX = ".wgwl"
+
+
+class WordlistFile:
+    def __init__(
+        self,
+        codes: np.ndarray,
+        ratings: np.ndarray,
+        alphabet: np.ndarray,
+        fingerprint: bytes,
+        masks: np.ndarray,
+        revision: tuple = (0, 0),
+    ) -> None:
+        self.codes = codes
+        self.ratings = ratings
+        self.alphabet = alphabet
+        self.fingerprint = fingerprint
+        self.masks = masks
+        self.revision = revision
+
+    @property
+    def word_length(self) -> int:
+        return self.codes.shape[1]
+
+    @property
+    def words(self) -> list:
+        codepoints = self.alphabet[self.codes].astype("<u4")
+        return codepoints.view(f"<U{self.word_length}").ravel().tolist()
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def index(self) -> WordIndex:
+        letters = self.alphabet.astype("<u4").tobytes().decode("utf-32-le")
+        text = self.alphabet[self.codes].astype("<u4").tobytes().decode("utf-32-le")
+        ratings = array("q")
+        ratings.frombytes(self.ratings.tobytes())
+
+        word_length = self.word_length
+        masks = [int.from_bytes(row, "little") for row in self.masks]
+        positions = []
+        for position in range(word_length):
+            start = position * len(letters)
+            end = start + len(letters)
+            positions.append({char: mask for char, mask in zip(letters, masks[start:end]) if mask})
+        counts = {}
+        for idx, char in enumerate(letters):
+            start = word_length * len(letters) + idx * word_length
+            end = start + word_length
+            if masks[start]:
+                counts[char] = masks[start:end]
+
+        index = WordIndex.from_masks(
+            text, word_length, ratings, Alphabet("", letters), positions, counts, np.asarray(self.codes)
+        )
+        if index.fingerprint != self.fingerprint:
+            raise ValueError("Wordlist file does not match its fingerprint")
+        return index
+
+    @classmethod
+    def load(cls, path: Path) -> "WordlistFile":
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        if len(buffer) < HEADER_SIZE:
+            raise ValueError(f"Not a wordlist file: {path}")
+
+        magic, version, word_length, alphabet_size, word_count, fingerprint, pk, revision = HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(f"Not a wordlist file: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported wordlist file version {version} in {path}")
+
+        dtype = code_dtype(alphabet_size)
+        offset = HEADER_SIZE
+        ratings = np.frombuffer(buffer, dtype="<i8", count=word_count, offset=offset)
+        offset += ratings.nbytes
+        alphabet = np.frombuffer(buffer, dtype="<u4", count=alphabet_size, offset=offset)
+        offset += alphabet.nbytes
+        codes = np.frombuffer(buffer, dtype=dtype, count=word_count * word_length, offset=offset)
+        offset += codes.nbytes
+        mask_count = 2 * word_length * alphabet_size
+        mask_bytes = (word_count + 7) // 8
+        masks = np.frombuffer(buffer, dtype=np.uint8, count=mask_count * mask_bytes, offset=offset)
+        return cls(
+            codes.reshape(word_count, word_length),
+            ratings,
+            alphabet,
+            fingerprint,
+            masks.reshape(mask_count, mask_bytes),
+            (pk, revision),
+        )
+
+
+def wordlist_key(wordlist_name: str) -> str:
+    digest = hashlib.sha256(wordlist_name.encode("utf-8")).hexdigest()[:16]
+    return f"{slugify(wordlist_name)}-{digest}"
+
+
+def wordlist_path(wordlist_name: str, word_length: int) -> Path:
+    return Path(settings.GUESSAPP_DATA_DIR) / f"{wordlist_key(wordlist_name)}-{word_length}{SUFFIX}"
+
+
+def wordlist_files(wordlist_name: str) -> list:
+    pattern = re.compile(rf"{re.escape(wordlist_key(wordlist_name))}-\d+{re.escape(SUFFIX)}")
+    data_dir = Path(settings.GUESSAPP_DATA_DIR)
+    if not data_dir.is_dir():
+        return []
+    return sorted(path for path in data_dir.iterdir() if pattern.fullmatch(path.name))
+
+
+def remove_wordlist_files(wordlist_name: str):
+    for path in wordlist_files(wordlist_name):
+        path.unlink(missing_ok=True)
+
+
+def write_wordlist_file(path: Path, index: WordIndex, revision: tuple = (0, 0)) -> int:
+    letters = index.alphabet.letters
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    mask_bytes = (len(index) + 7) // 8
+
+    with open(tmp_path, "wb") as file:
+        header = HEADER.pack(MAGIC, VERSION, index.word_length, len(letters), len(index), index.fingerprint, *revision)
+        file.write(header.ljust(HEADER_SIZE, b"\0"))
+        file.write(np.asarray(index.ratings, dtype="<i8").tobytes())
+        file.write(letters.encode("utf-32-le"))
+        file.write(index.codes.tobytes())
+        for position in range(index.word_length):
+            for char in letters:
+                file.write(index.position_mask(position, char).to_bytes(mask_bytes, "little"))
+        for char in letters:
+            for occurences in range(1, index.word_length + 1):
+                file.write(index.count_mask(char, occurences).to_bytes(mask_bytes, "little"))
+    os.replace(tmp_path, path)
+
+    return path.stat().st_size
@@ -0,0 +1,48 @@
+from collections import defaultdict
+
+from guessapp.alphabet import Alphabet
+from guessapp.histogram import Histogram
+
+
+_character_counts = {}
+
+_alphabet = None
+
+
+def read_words(lines, alphabet: Alphabet = None):
+    for line in lines:
+        word = line.strip()
+        word_len = len(word)
+        is_word = True
+
+        for i in range(1, word_len):
+            if word[i].isupper():
+                is_word = False
+                break
+
+        if is_word:
+            word = word.lower() if alphabet is None else alphabet.normalize(word)
+            if alphabet is None or alphabet.is_valid(word):
+                yield word
+
+
+def count_characters(lines, alphabet: Alphabet = None) -> dict:
+    words_by_length = defaultdict(list)
+    for word in read_words(lines, alphabet):
+        words_by_length[len(word)].append(word)
+
+    return {length: Histogram.from_words(words) for length, words in words_by_length.items()}
+
+
+def init_rating(character_counts: dict, alphabet: Alphabet = None):
+    global _character_counts, _alphabet
+    _character_counts = character_counts
+    _alphabet = alphabet
+
+
+def rate_words(lines) -> list:
+    rated_words = []
+    for word in read_words(lines, _alphabet):
+        counts = _character_counts[len(word)]
+        rated_words.append((word, sum(counts[char] for char in set(word))))
+    return rated_words
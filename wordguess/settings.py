@@ -54,6 +54,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "guessapp.middleware.query_metrics_middleware",
 ]
 
 ROOT_URLCONF = "wordguess.urls"
@@ -119,3 +120,26 @@ STATIC_URL = os.environ.get("STATIC_URL", "static/")
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Word guessing
+
+GUESSAPP_INDEX_CACHE_BYTES = int(os.environ.get("GUESSAPP_INDEX_CACHE_BYTES", 512 * 1024 * 1024))
+
+GUESSAPP_INDEX_CHECK_SECONDS = float(os.environ.get("GUESSAPP_INDEX_CHECK_SECONDS", 5))
+
+GUESSAPP_METRICS = os.environ.get("GUESSAPP_METRICS", "False") == "True"
+
+GUESSAPP_MEMO_BACKEND = os.environ.get("GUESSAPP_MEMO_BACKEND", "local")
+
+GUESSAPP_MEMO_SIZE = int(os.environ.get("GUESSAPP_MEMO_SIZE", 10000))
+
+GUESSAPP_MEMO_BYTES = int(os.environ.get("GUESSAPP_MEMO_BYTES", 64 * 1024 * 1024))
+
+GUESSAPP_MEMO_TTL = float(os.environ.get("GUESSAPP_MEMO_TTL", 3600))
+
+GUESSAPP_DB_THREADS = int(os.environ.get("GUESSAPP_DB_THREADS", 4))
+
+GUESSAPP_PRELOAD_INDEXES = os.environ.get("GUESSAPP_PRELOAD_INDEXES", "False") == "True"
+
+GUESSAPP_DATA_DIR = os.environ.get("GUESSAPP_DATA_DIR", BASE_DIR / "data")